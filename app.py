@@ -4,13 +4,14 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
+import io
 import json
 
-from deconfliction_engine import DeconflictionEngine
+from deconfliction_engine import DeconflictionEngine, TrajectoryArray
 from trajectory_calculator import TrajectoryCalculator
 from visualization import VisualizationManager
 from scenario_generator import ScenarioGenerator
-from utils import format_time, calculate_distance_3d, validate_waypoints
+from utils import format_time, calculate_distance_3d, validate_waypoints, downsample_for_plot
 
 # Page configuration
 st.set_page_config(
@@ -30,6 +31,60 @@ if 'deconfliction_engine' not in st.session_state:
     st.session_state.conflict_results = None
     st.session_state.animation_time = 0
 
+# Conflicts listed individually below the conflict table
+MAX_CONFLICT_DETAILS = 5
+
+def _waypoints_key(waypoints):
+    """
+    Convert waypoint dictionaries into a hashable cache key.
+    """
+    return tuple(tuple(sorted(wp.items())) for wp in waypoints)
+
+@st.cache_data(max_entries=128)
+def _compute_trajectory(waypoints_key, start_time, end_time, time_step):
+    """
+    Calculate a trajectory once per mission and time step.
+    Reruns triggered by the buffer or animation sliders reuse the cached result.
+    """
+    waypoints = [dict(wp) for wp in waypoints_key]
+    return TrajectoryCalculator().calculate_trajectory(waypoints, start_time, end_time, time_step)
+
+@st.cache_data(max_entries=64)
+def _check_conflicts(_engine, scenario_key, safety_buffer, _primary_trajectory, _other_trajectories,
+                     max_conflicts=None):
+    """
+    Run conflict detection once per scenario, time step, safety buffer and cap.
+    The trajectories are identified by `scenario_key` rather than hashed.
+    """
+    return _engine.check_conflicts(_primary_trajectory, _other_trajectories, safety_buffer,
+                                   max_conflicts=max_conflicts)
+
+def _plot_points(frames):
+    """
+    Downsampled structure-of-arrays points for the Plotly traces; detection keeps the full arrays.
+    """
+    xyz, times = downsample_for_plot(frames.xyz, frames.times)
+    
+    return {'x': xyz[:, 0], 'y': xyz[:, 1], 'z': xyz[:, 2], 'time': times}
+
+def _frame_position(frames, current_time, max_gap=30):
+    """
+    Get the trajectory sample closest to the animation time, if within `max_gap` seconds.
+    """
+    times = frames.times
+    if len(times) == 0:
+        return None
+    
+    idx = int(np.searchsorted(times, current_time))
+    if idx == len(times) or (idx > 0 and current_time - times[idx - 1] <= times[idx] - current_time):
+        idx -= 1
+    
+    if abs(times[idx] - current_time) > max_gap:
+        return None
+    
+    x, y, z = frames.xyz[idx].tolist()
+    return {'x': x, 'y': y, 'z': z, 'time': float(times[idx])}
+
 def main():
     st.title("🚁 UAV Strategic Deconfliction System")
     st.markdown("### Interactive 3D Airspace Conflict Detection and Analysis")
@@ -87,6 +142,14 @@ def main():
             help="Temporal resolution for conflict checking"
         )
         
+        # Only the first conflict record is needed for a pass/fail answer
+        pass_fail_only = st.checkbox(
+            "Pass/Fail Check Only",
+            value=False,
+            help="Report only whether the mission has any conflicts"
+        )
+        max_conflicts = 1 if pass_fail_only else None
+        
         # 3D visualization toggle
         enable_3d = st.checkbox("Enable 3D Visualization", value=True)
         
@@ -122,41 +185,82 @@ def main():
             primary_mission = st.session_state.current_scenario['primary_mission']
             other_flights = st.session_state.current_scenario['other_flights']
             
-            # Calculate trajectories
-            primary_trajectory = st.session_state.trajectory_calculator.calculate_trajectory(
-                primary_mission['waypoints'],
+            primary_key = (
+                _waypoints_key(primary_mission['waypoints']),
                 primary_mission['start_time'],
-                primary_mission['end_time'],
-                time_step
+                primary_mission['end_time']
+            )
+            other_keys = tuple(
+                (flight['flight_id'], _waypoints_key(flight['waypoints']),
+                 flight['start_time'], flight['end_time'])
+                for flight in other_flights
             )
+            scenario_key = (primary_key, other_keys, time_step)
+            
+            # Only the missions, time step, buffer and conflict cap affect the analysis;
+            # animation changes just pick a different frame below
+            analysis_key = (scenario_key, safety_buffer, max_conflicts)
+            should_recompute = st.session_state.get('analysis_key') != analysis_key
             
-            other_trajectories = []
-            for flight in other_flights:
-                traj = st.session_state.trajectory_calculator.calculate_trajectory(
-                    flight['waypoints'],
-                    flight['start_time'],
-                    flight['end_time'],
-                    time_step
+            if should_recompute and st.session_state.get('frames_key') != scenario_key:
+                # Calculate trajectories (cached per mission and time step)
+                primary_trajectory = _compute_trajectory(*primary_key, time_step)
+                
+                other_trajectories = []
+                for flight_id, *flight_key in other_keys:
+                    other_trajectories.append({
+                        'trajectory': _compute_trajectory(*flight_key, time_step),
+                        'flight_id': flight_id
+                    })
+                
+                # Array form shared by the engine and the animation frame lookup;
+                # kept across buffer changes so the engine can reuse its resampling
+                primary_frames = TrajectoryArray.from_trajectory(primary_trajectory)
+                other_frames = {
+                    data['flight_id']: TrajectoryArray.from_trajectory(data['trajectory'])
+                    for data in other_trajectories
+                }
+                
+                # Plot a bounded number of points per trajectory
+                st.session_state.primary_trajectory = _plot_points(primary_frames)
+                st.session_state.other_trajectories = [
+                    {'trajectory': _plot_points(frames), 'flight_id': flight_id}
+                    for flight_id, frames in other_frames.items()
+                ]
+                st.session_state.primary_frames = primary_frames
+                st.session_state.other_frames = other_frames
+                st.session_state.frames_key = scenario_key
+            
+            if should_recompute:
+                # Perform deconfliction analysis
+                st.session_state.conflict_results = _check_conflicts(
+                    st.session_state.deconfliction_engine,
+                    scenario_key,
+                    safety_buffer,
+                    st.session_state.primary_frames,
+                    [{'trajectory': frames, 'flight_id': flight_id}
+                     for flight_id, frames in st.session_state.other_frames.items()],
+                    max_conflicts=max_conflicts
                 )
-                other_trajectories.append({
-                    'trajectory': traj,
-                    'flight_id': flight['flight_id']
-                })
+                st.session_state.analysis_key = analysis_key
             
-            # Perform deconfliction analysis
-            st.session_state.conflict_results = st.session_state.deconfliction_engine.check_conflicts(
-                primary_trajectory,
-                other_trajectories,
-                safety_buffer
-            )
+            # Current positions for the animation frame
+            current_time = st.session_state.animation_time
+            primary_position = _frame_position(st.session_state.primary_frames, current_time)
+            other_positions = {
+                flight_id: _frame_position(frames, current_time)
+                for flight_id, frames in st.session_state.other_frames.items()
+            }
             
             # Create visualization
             fig = st.session_state.visualization_manager.create_airspace_plot(
-                primary_trajectory,
-                other_trajectories,
+                st.session_state.primary_trajectory,
+                st.session_state.other_trajectories,
                 st.session_state.conflict_results,
-                current_time=st.session_state.animation_time,
-                enable_3d=enable_3d
+                current_time=current_time,
+                enable_3d=enable_3d,
+                primary_position=primary_position,
+                other_positions=other_positions
             )
             
             st.plotly_chart(fig, use_container_width=True, height=600)
@@ -185,17 +289,17 @@ def main():
             
             if st.button("Create Custom Mission"):
                 try:
-                    waypoints = []
-                    for line in waypoint_input.strip().split('\n'):
-                        if line.strip():
-                            parts = [float(x.strip()) for x in line.split(',')]
-                            if len(parts) >= 4:
-                                waypoints.append({
-                                    'x': parts[0],
-                                    'y': parts[1],
-                                    'z': parts[2] if len(parts) > 2 else 50,
-                                    'time': parts[3] if len(parts) > 3 else 0
-                                })
+                    # Parse the whole block in one call: one x,y,z,time row per line
+                    waypoint_array = np.loadtxt(
+                        io.StringIO(waypoint_input.strip()), delimiter=',', ndmin=2
+                    )
+                    if waypoint_array.shape[1] < 4:
+                        raise ValueError("each waypoint needs x, y, z and time values")
+                    
+                    waypoints = [
+                        dict(zip(('x', 'y', 'z', 'time'), row))
+                        for row in waypoint_array[:, :4].tolist()
+                    ]
                     
                     if validate_waypoints(waypoints):
                         custom_scenario = st.session_state.scenario_generator.create_custom_scenario(
@@ -216,10 +320,19 @@ def main():
         if st.session_state.conflict_results:
             conflicts = st.session_state.conflict_results['conflicts']
             
-            if conflicts:
+            if conflicts and pass_fail_only:
+                st.error("🚨 Mission Has Conflicts")
+                st.write("Disable the pass/fail check to list every conflict.")
+            elif conflicts:
                 st.error(f"🚨 {len(conflicts)} Conflict(s) Detected")
                 
-                for i, conflict in enumerate(conflicts):
+                conflicts_df = st.session_state.conflict_results['conflicts_df']
+                st.dataframe(conflicts_df, hide_index=True)
+                
+                # Details for the most severe conflicts only
+                top_conflicts = conflicts_df.nlargest(MAX_CONFLICT_DETAILS, 'severity_score')
+                for i in top_conflicts.index:
+                    conflict = conflicts[i]
                     with st.expander(f"Conflict {i+1}: {conflict['type'].title()}"):
                         st.write(f"**Location:** ({conflict['location']['x']:.1f}, {conflict['location']['y']:.1f}, {conflict['location']['z']:.1f})")
                         st.write(f"**Time:** {format_time(conflict['time'])}")
@@ -285,7 +398,8 @@ def main():
                 
                 st.download_button(
                     label="Download Analysis",
-                    data=json.dumps(analysis_data, indent=2),
+                    # Predefined scenarios are read-only mappings; export them as objects
+                    data=json.dumps(analysis_data, indent=2, default=dict),
                     file_name=f"deconfliction_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                     mime="application/json"
                 )
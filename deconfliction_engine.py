@@ -1,7 +1,183 @@
 import numpy as np
+import pandas as pd
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple
-from utils import calculate_distance_3d, interpolate_position
+from itertools import islice, product
+from typing import List, Dict, Any, Iterator, Tuple, Union
+from deconfliction_kernels import scenario_violations, warm_up
+from trajectory_calculator import Trajectory
+from utils import calculate_squared_distance_3d, build_conflict_tree, query_conflict_tree, cKDTree
+
+
+def _interp_xyz(times: np.ndarray, xyz: np.ndarray, target_time: float) -> np.ndarray:
+    """
+    Interpolate the (3,) position at `target_time` from sorted, non-empty samples.
+    Times outside the samples are clamped to the first/last point.
+    """
+    idx = int(np.searchsorted(times, target_time))
+    
+    # Clamp to the trajectory ends, otherwise interpolate
+    if idx == 0:
+        return xyz[0]
+    if idx == len(times):
+        return xyz[-1]
+    
+    ratio = (target_time - times[idx - 1]) / (times[idx] - times[idx - 1])
+    return xyz[idx - 1] + ratio * (xyz[idx] - xyz[idx - 1])
+
+
+@dataclass(eq=False)
+class TrajectoryArray:
+    """
+    Structure-of-arrays trajectory: sorted sample times and an (N, 3) position array.
+    
+    Positions are stored as float32 (sub-millimetre error over 10 km, far below
+    any safety buffer); times stay float64 so the time grid is exact.
+    """
+    times: np.ndarray
+    xyz: np.ndarray
+    _bbox: Tuple = field(default=None, init=False, repr=False)
+    _times_hash: int = field(default=None, init=False, repr=False)
+    _grid_cache: Tuple = field(default=None, init=False, repr=False)
+    _segments: Tuple = field(default=None, init=False, repr=False)
+    
+    @classmethod
+    def from_point_list(cls, points: List[Dict]) -> 'TrajectoryArray':
+        """
+        Stack a list of trajectory point dictionaries into arrays once.
+        """
+        times = np.asarray([point['time'] for point in points], dtype=np.float64)
+        xyz = np.asarray([[point['x'], point['y'], point['z']] for point in points],
+                         dtype=np.float32).reshape(-1, 3)
+        
+        order = np.argsort(times, kind='stable')
+        return cls(times[order], xyz[order])
+    
+    @classmethod
+    def from_trajectory(cls, trajectory: Trajectory) -> 'TrajectoryArray':
+        """
+        Take the time and position columns of a `Trajectory`.
+        """
+        times = np.asarray(trajectory.time, dtype=np.float64)
+        xyz = np.column_stack((trajectory.x, trajectory.y, trajectory.z)).astype(np.float32)
+        
+        order = np.argsort(times, kind='stable')
+        return cls(times[order], xyz[order])
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    @property
+    def bbox(self) -> Tuple[np.ndarray, np.ndarray, float, float]:
+        """
+        Spatial (lo, hi) corners and time window (t0, t1), computed once.
+        """
+        if self._bbox is None:
+            self._bbox = (self.xyz.min(axis=0), self.xyz.max(axis=0),
+                          float(self.times[0]), float(self.times[-1]))
+        
+        return self._bbox
+    
+    @property
+    def times_hash(self) -> int:
+        """
+        Hash of the sample times, computed once.
+        """
+        if self._times_hash is None:
+            self._times_hash = hash(self.times.tobytes())
+        
+        return self._times_hash
+    
+    def has_times(self, times: np.ndarray, times_hash: int) -> bool:
+        """
+        Whether the trajectory is sampled exactly at `times` (with hash `times_hash`).
+        
+        The hash only rules arrays out cheaply; a match is confirmed element-wise.
+        """
+        return (self.times.shape == times.shape and self.times_hash == times_hash
+                and np.array_equal(self.times, times))
+    
+    @property
+    def segments(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-sample (N, 3) step to the next sample and (N,) reciprocal step
+        duration, computed once. The last sample and zero-duration steps get 0,
+        so interpolating from them returns the sample itself.
+        """
+        if self._segments is None:
+            steps = np.zeros_like(self.xyz)
+            steps[:-1] = np.diff(self.xyz, axis=0)
+            
+            dt = np.diff(self.times)
+            inv_dt = np.zeros(len(self.times))
+            np.divide(1.0, dt, out=inv_dt[:-1], where=dt > 0)
+            self._segments = (steps, inv_dt)
+        
+        return self._segments
+    
+    def positions_at(self, target_times: np.ndarray) -> np.ndarray:
+        """
+        Linearly interpolate (T, 3) positions at the given times.
+        Times outside the trajectory are clamped to its first/last point.
+        """
+        t, xyz = self.times, self.xyz
+        steps, inv_dt = self.segments
+        
+        # Sample at the start of each target's segment; past the end, the last sample
+        before = np.clip(np.searchsorted(t, target_times) - 1, 0, len(t) - 1)
+        
+        # Before the first sample the fraction is negative and clamps to 0
+        w = np.maximum((target_times - t[before]) * inv_dt[before], 0.0).astype(xyz.dtype)
+        
+        return xyz[before] + w[:, None] * steps[before]
+    
+    def position_at(self, target_time: float) -> np.ndarray:
+        """
+        Get the (3,) position at a single time, or None for an empty trajectory.
+        """
+        if len(self.times) == 0:
+            return None
+        
+        return _interp_xyz(self.times, self.xyz, target_time)
+
+
+class _SpatioTemporalIndex:
+    """
+    Uniform hash grid over other-flight positions sampled on a common time grid.
+    Cells are keyed by (ix, iy, iz, it), where the spatial indices use a cell
+    size of at least the safety buffer and `it` is the slot on the time grid.
+    """
+    
+    _NEIGHBOR_OFFSETS = list(product((-1, 0, 1), repeat=3))
+    
+    def __init__(self, other_xyz: np.ndarray, sampled: np.ndarray, cell_size: float):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        
+        cell_idx = np.floor(other_xyz / cell_size).astype(np.int64)
+        for j, i in zip(*np.nonzero(sampled)):
+            ix, iy, iz = cell_idx[j, i]
+            self.cells[(int(ix), int(iy), int(iz), int(i))].append(int(j))
+    
+    def covers(self, safety_buffer: float) -> bool:
+        """
+        Whether neighbor queries stay exact for the given buffer.
+        """
+        return safety_buffer <= self.cell_size
+    
+    def query(self, position: np.ndarray, time_index: int) -> List[int]:
+        """
+        Get the flights with a sample in the 27 cells around a position.
+        """
+        ix, iy, iz = (int(c) for c in np.floor(position / self.cell_size))
+        
+        candidates = []
+        for dx, dy, dz in self._NEIGHBOR_OFFSETS:
+            candidates.extend(self.cells.get((ix + dx, iy + dy, iz + dz, time_index), ()))
+        
+        return candidates
+
 
 class DeconflictionEngine:
     """
@@ -15,21 +191,39 @@ class DeconflictionEngine:
             'temporal': 'Temporal overlap conflict',
             'trajectory': 'Trajectory intersection conflict'
         }
+        
+        # Scenarios with at least this many candidate flights use a spatial index
+        # (a KD-tree with SciPy, otherwise the hash grid); below that the
+        # batched kernel is faster
+        self.spatial_index_threshold = 1000
+        self._spatial_index = None
+        self._spatial_index_key = None
+        self._conflict_tree = None
+        self._conflict_tree_key = None
+        
+        # Compile the detection kernel up front rather than on the first check
+        warm_up()
     
-    def check_conflicts(self, primary_trajectory: List[Dict], other_trajectories: List[Dict], 
-                       safety_buffer: float = 50.0) -> Dict[str, Any]:
+    def check_conflicts(self, primary_trajectory: Union[TrajectoryArray, Trajectory, List[Dict]],
+                       other_trajectories: List[Dict], 
+                       safety_buffer: float = 50.0,
+                       max_conflicts: int = None) -> Dict[str, Any]:
         """
         Main conflict detection method.
         
         Args:
-            primary_trajectory: List of trajectory points for primary drone
-            other_trajectories: List of trajectory data for other drones
+            primary_trajectory: TrajectoryArray, Trajectory or list of trajectory points
+                for primary drone
+            other_trajectories: List of trajectory data for other drones; each
+                'trajectory' may be any of the same forms
             safety_buffer: Minimum safe distance in meters
+            max_conflicts: Return at most this many conflicts (e.g. 1 for a pass/fail
+                check); None returns them all. Every pair is still checked and
+                sorted; only the records past the limit are not built
             
         Returns:
             Dictionary containing conflict analysis results
         """
-        conflicts = []
         analysis_summary = {
             'total_checks': 0,
             'spatial_violations': 0,
@@ -37,20 +231,21 @@ class DeconflictionEngine:
             'safe_segments': 0
         }
         
-        for other_traj_data in other_trajectories:
-            other_trajectory = other_traj_data['trajectory']
-            other_flight_id = other_traj_data['flight_id']
-            
-            # Perform pairwise conflict detection
-            traj_conflicts = self._detect_trajectory_conflicts(
-                primary_trajectory,
-                other_trajectory,
-                other_flight_id,
-                safety_buffer
-            )
-            
-            conflicts.extend(traj_conflicts)
-            analysis_summary['total_checks'] += len(primary_trajectory) * len(other_trajectory)
+        # Convert every trajectory to arrays once
+        primary = self._as_trajectory_array(primary_trajectory)
+        others = [self._as_trajectory_array(data['trajectory']) for data in other_trajectories]
+        flight_ids = [data['flight_id'] for data in other_trajectories]
+        
+        # Check all other flights against the primary in one batched pass;
+        # records are built lazily in severity and time order, so the limit
+        # skips building the rest
+        conflicts = list(islice(
+            self._detect_trajectory_conflicts(primary, others, flight_ids, safety_buffer),
+            max_conflicts
+        ))
+        
+        for other in others:
+            analysis_summary['total_checks'] += len(primary) * len(other)
         
         # Classify conflicts
         for conflict in conflicts:
@@ -59,103 +254,282 @@ class DeconflictionEngine:
             elif conflict['type'] == 'temporal':
                 analysis_summary['temporal_violations'] += 1
         
-        # Sort conflicts by severity and time
-        conflicts.sort(key=lambda x: (x['severity_score'], x['time']))
-        
         return {
             'conflicts': conflicts,
+            'conflicts_df': self._conflicts_frame(conflicts),
             'summary': analysis_summary,
             'is_safe': len(conflicts) == 0,
             'total_conflicts': len(conflicts)
         }
     
-    def _detect_trajectory_conflicts(self, primary_traj: List[Dict], other_traj: List[Dict],
-                                   other_flight_id: str, safety_buffer: float) -> List[Dict]:
+    def _conflicts_frame(self, conflicts: List[Dict]) -> pd.DataFrame:
+        """
+        Columnar view of the conflict records, one row per conflict in the same order.
+        """
+        return pd.DataFrame({
+            'time': [c['time'] for c in conflicts],
+            'x': [c['location']['x'] for c in conflicts],
+            'y': [c['location']['y'] for c in conflicts],
+            'z': [c['location']['z'] for c in conflicts],
+            'distance': [c['distance'] for c in conflicts],
+            'severity': [c['severity'] for c in conflicts],
+            'severity_score': [c['severity_score'] for c in conflicts],
+            'other_flight_id': [c['other_flight_id'] for c in conflicts]
+        })
+    
+    def _as_trajectory_array(self, trajectory: Union[TrajectoryArray, Trajectory, List[Dict]]) -> TrajectoryArray:
+        """
+        Convert Trajectory and list-of-dict trajectories at the API boundary; arrays pass through.
+        """
+        if isinstance(trajectory, TrajectoryArray):
+            return trajectory
+        if isinstance(trajectory, Trajectory):
+            return TrajectoryArray.from_trajectory(trajectory)
+        
+        return TrajectoryArray.from_point_list(trajectory)
+    
+    def _detect_trajectory_conflicts(self, primary: TrajectoryArray,
+                                   others: List[TrajectoryArray],
+                                   flight_ids: List[str], safety_buffer: float) -> Iterator[Dict]:
+        """
+        Detect conflicts between the primary trajectory and all other trajectories.
+        
+        Every trajectory is resampled onto one common time grid and stacked into
+        an (M, T, 3) tensor so all pairs are checked in a single kernel call.
+        Each pair is still only compared at its own time stamps. Conflict
+        records are yielded one at a time.
+        """
+        if len(primary) == 0:
+            return
+        
+        # Only pairs that pass the bounding-box prefilter need a full check
+        active = [k for k, other in enumerate(others)
+                  if len(other) and self._may_conflict(primary, other, safety_buffer)]
+        if not active:
+            return
+        
+        others = [others[k] for k in active]
+        flight_ids = [flight_ids[k] for k in active]
+        
+        # Common sorted time grid across all trajectories
+        time_grid = np.unique(np.concatenate([primary.times] + [other.times for other in others]))
+        
+        # Get positions at these times (interpolate if necessary)
+        grid_hash = hash(time_grid.tobytes())
+        primary_xyz, primary_sampled = self._interp_on_grid(primary, time_grid, grid_hash)
+        resampled = [self._interp_on_grid(other, time_grid, grid_hash) for other in others]
+        
+        other_xyz = np.stack([xyz for xyz, _ in resampled])
+        sampled = np.stack([primary_sampled | other_sampled for _, other_sampled in resampled])
+        
+        if len(others) >= self.spatial_index_threshold:
+            flight_idx, time_idx, distances = self._indexed_violations(
+                primary_xyz, other_xyz, sampled, safety_buffer
+            )
+        else:
+            flight_idx, time_idx, distances = scenario_violations(
+                primary_xyz, other_xyz, sampled, safety_buffer
+            )
+        
+        yield from self._build_conflicts_vectorized(
+            time_grid[time_idx], distances, primary_xyz[time_idx],
+            other_xyz[flight_idx, time_idx], np.asarray(flight_ids, dtype=object)[flight_idx],
+            safety_buffer
+        )
+    
+    def _interp_on_grid(self, trajectory: TrajectoryArray, time_grid: np.ndarray,
+                        grid_hash: int) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Detect conflicts between two specific trajectories.
+        Get (T, 3) positions on the time grid and a mask of the trajectory's own samples.
+        
+        Trajectories already sampled on the grid are used as-is. Otherwise the
+        result is cached on the trajectory, so checking the same trajectories
+        again (e.g. with a different safety buffer) skips the interpolation.
         """
-        conflicts = []
+        if trajectory.has_times(time_grid, grid_hash):
+            return trajectory.xyz, np.ones(len(time_grid), dtype=bool)
         
-        # Create time-indexed lookups for efficient checking
-        primary_by_time = {point['time']: point for point in primary_traj}
-        other_by_time = {point['time']: point for point in other_traj}
+        # The cached grid is kept so a hash match can be confirmed element-wise
+        cache = trajectory._grid_cache
+        if cache is None or cache[1] != grid_hash or not np.array_equal(cache[0], time_grid):
+            cache = trajectory._grid_cache = (
+                time_grid,
+                grid_hash,
+                trajectory.positions_at(time_grid),
+                np.isin(time_grid, trajectory.times)
+            )
+        
+        return cache[2], cache[3]
+    
+    def _build_conflicts_vectorized(self, times: np.ndarray, distances: np.ndarray,
+                                    primary_xyz: np.ndarray, other_xyz: np.ndarray,
+                                    other_flight_ids: np.ndarray, safety_buffer: float) -> Iterator[Dict]:
+        """
+        Build conflict records for a set of violations in one vectorized pass.
         
-        # Get all unique time points
-        all_times = sorted(set(primary_by_time.keys()) | set(other_by_time.keys()))
+        Severity, severity score and conflict location are computed as arrays;
+        only the final records are assembled in Python, lazily and in order of
+        severity score and time.
+        """
+        # Distances are reported in float64 and rounded to the millimetre, the
+        # precision of the float32 positions; scores and bands use the same value
+        distances = np.round(distances.astype(np.float64), 3)
+        severity_scores = np.maximum(0, (safety_buffer - distances) / safety_buffer)
+        
+        # Sort by severity score, then time
+        order = np.lexsort((times, severity_scores))
+        times, distances, severity_scores = times[order], distances[order], severity_scores[order]
+        primary_xyz, other_xyz = primary_xyz[order], other_xyz[order]
+        other_flight_ids = other_flight_ids[order]
         
-        for time_point in all_times:
-            # Get positions at this time (interpolate if necessary)
-            primary_pos = self._get_position_at_time(primary_traj, time_point)
-            other_pos = self._get_position_at_time(other_traj, time_point)
+        severities = np.select(
+            [distances < safety_buffer * 0.5, distances < safety_buffer * 0.8],
+            ['HIGH', 'MEDIUM'],
+            default='LOW'
+        )
+        # Positions are rounded the same way; whole-second times are reported as ints
+        primary_xyz, other_xyz = primary_xyz.astype(np.float64), other_xyz.astype(np.float64)
+        locations = np.round((primary_xyz + other_xyz) * 0.5, 3)
+        primary_xyz, other_xyz = np.round(primary_xyz, 3), np.round(other_xyz, 3)
+        times = [int(t) if t.is_integer() else t for t in times.tolist()]
+        
+        for t, d, p, o, location, flight_id, severity, score in zip(
+            times, distances.tolist(), primary_xyz, other_xyz,
+            locations.tolist(), other_flight_ids, severities.tolist(),
+            severity_scores.tolist()
+        ):
+            yield self._create_conflict_record(
+                self._position_dict(p, t), self._position_dict(o, t), t, d,
+                flight_id, safety_buffer, location, severity, score
+            )
+    
+    def _indexed_violations(self, primary_xyz: np.ndarray, other_xyz: np.ndarray,
+                            sampled: np.ndarray,
+                            safety_buffer: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find violations with a spatial index instead of checking every pair.
+        Returns the same (flight indices, time indices, distances) as the kernel.
+        
+        With SciPy the sampled positions go into one KD-tree (see
+        `utils.build_conflict_tree`); otherwise a spatio-temporal hash grid is
+        queried per primary sample.
+        """
+        key = hash((other_xyz.tobytes(), sampled.tobytes()))
+        if cKDTree is not None:
+            return self._tree_violations(primary_xyz, other_xyz, sampled, safety_buffer, key)
+        
+        # Reuse the last index while the scenario is unchanged and the buffer still fits
+        if (self._spatial_index is None or self._spatial_index_key != key
+                or not self._spatial_index.covers(safety_buffer)):
+            self._spatial_index = _SpatioTemporalIndex(other_xyz, sampled, safety_buffer)
+            self._spatial_index_key = key
+        
+        flight_idx, time_idx, distances = [], [], []
+        for i, position in enumerate(primary_xyz):
+            candidates = self._spatial_index.query(position, i)
+            if not candidates:
+                continue
             
-            if primary_pos and other_pos:
-                distance = calculate_distance_3d(primary_pos, other_pos)
-                
-                if distance < safety_buffer:
-                    conflict = self._create_conflict_record(
-                        primary_pos, other_pos, time_point, distance,
-                        other_flight_id, safety_buffer
-                    )
-                    conflicts.append(conflict)
-        
-        return conflicts
-    
-    def _get_position_at_time(self, trajectory: List[Dict], target_time: float) -> Dict:
-        """
-        Get drone position at specific time, interpolating if necessary.
-        """
-        # Find exact match first
-        for point in trajectory:
-            if point['time'] == target_time:
-                return point
-        
-        # Find surrounding points for interpolation
-        before_point = None
-        after_point = None
-        
-        for point in trajectory:
-            if point['time'] < target_time:
-                if not before_point or point['time'] > before_point['time']:
-                    before_point = point
-            elif point['time'] > target_time:
-                if not after_point or point['time'] < after_point['time']:
-                    after_point = point
-        
-        # Interpolate position
-        if before_point and after_point:
-            return interpolate_position(before_point, after_point, target_time)
-        elif before_point:
-            return before_point
-        elif after_point:
-            return after_point
-        
-        return None
+            d2 = calculate_squared_distance_3d(other_xyz[candidates, i], position)
+            hits = d2 < safety_buffer * safety_buffer
+            flight_idx.extend(np.asarray(candidates)[hits])
+            time_idx.extend([i] * int(hits.sum()))
+            distances.extend(np.sqrt(d2[hits]))
+        
+        # Match the kernel's (flight, time) ordering
+        flight_idx = np.asarray(flight_idx, dtype=np.int64)
+        time_idx = np.asarray(time_idx, dtype=np.int64)
+        order = np.lexsort((time_idx, flight_idx))
+        
+        return flight_idx[order], time_idx[order], np.asarray(distances, dtype=np.float64)[order]
     
-    def _create_conflict_record(self, primary_pos: Dict, other_pos: Dict, time_point: float,
-                              distance: float, other_flight_id: str, safety_buffer: float) -> Dict:
+    def _tree_violations(self, primary_xyz: np.ndarray, other_xyz: np.ndarray,
+                         sampled: np.ndarray, safety_buffer: float,
+                         key: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        `_indexed_violations` through a KD-tree over the other flights' sampled positions.
+        
+        Points are indexed with their time-grid slot as the time, so a query with
+        no time tolerance only pairs samples at the same grid time. The tree has
+        no cell size, so one build serves every safety buffer.
+        """
+        if self._conflict_tree is None or self._conflict_tree_key != key:
+            self._conflict_tree = build_conflict_tree([
+                {
+                    'trajectory': {'x': other_xyz[j, slots, 0], 'y': other_xyz[j, slots, 1],
+                                   'z': other_xyz[j, slots, 2],
+                                   'time': slots.astype(np.float64)},
+                    'flight_id': j
+                }
+                for j, slots in enumerate(np.nonzero(row)[0] for row in sampled)
+            ])
+            self._conflict_tree_key = key
+        
+        primary = {'x': primary_xyz[:, 0], 'y': primary_xyz[:, 1], 'z': primary_xyz[:, 2],
+                   'time': np.arange(len(primary_xyz), dtype=np.float64)}
+        time_idx, point_idx, distances = query_conflict_tree(self._conflict_tree, primary,
+                                                             safety_buffer)
+        flight_idx = self._conflict_tree['flight_ids'][point_idx].astype(np.int64)
+        
+        # Match the kernel's (flight, time) ordering
+        order = np.lexsort((time_idx, flight_idx))
+        
+        return flight_idx[order], time_idx[order], distances[order]
+    
+    def _may_conflict(self, primary: TrajectoryArray, other: TrajectoryArray,
+                      safety_buffer: float) -> bool:
         """
-        Create a detailed conflict record.
+        Cheap rejection test for trajectory pairs that can never come within the buffer.
         """
-        severity_score = max(0, (safety_buffer - distance) / safety_buffer)
+        primary_lo, primary_hi, primary_t0, primary_t1 = primary.bbox
+        other_lo, other_hi, other_t0, other_t1 = other.bbox
         
+        # Flights that are never airborne at the same time
+        if other_t1 < primary_t0 or primary_t1 < other_t0:
+            return False
+        
+        # Boxes separated by more than the buffer along any axis
+        if np.any(primary_lo - safety_buffer > other_hi) or np.any(other_lo - safety_buffer > primary_hi):
+            return False
+        
+        return True
+    
+    def _position_dict(self, xyz: np.ndarray, time_point: float) -> Dict:
+        """
+        Build a position dictionary from an (x, y, z) array row.
+        """
+        return {
+            'x': float(xyz[0]),
+            'y': float(xyz[1]),
+            'z': float(xyz[2]),
+            'time': time_point
+        }
+    
+    def _get_position_at_time(self, trajectory: Union[TrajectoryArray, Trajectory, List[Dict]],
+                              target_time: float) -> np.ndarray:
+        """
+        Get drone (x, y, z) position at specific time, interpolating if necessary.
+        Use `_position_dict` where the dictionary form is needed.
+        """
+        return self._as_trajectory_array(trajectory).position_at(target_time)
+    
+    def _create_conflict_record(self, primary_pos: Dict, other_pos: Dict, time_point: float,
+                              distance: float, other_flight_id: str, safety_buffer: float,
+                              location: List[float], severity: str, severity_score: float) -> Dict:
+        """
+        Create a detailed conflict record from precomputed severity and location.
+        """
         # Determine conflict type
         conflict_type = 'spatial'
         description = f"Drones within {distance:.1f}m at time {time_point}s"
         
-        if distance < safety_buffer * 0.5:
-            severity = 'HIGH'
-        elif distance < safety_buffer * 0.8:
-            severity = 'MEDIUM'
-        else:
-            severity = 'LOW'
-        
         return {
             'type': conflict_type,
             'time': time_point,
             'location': {
-                'x': (primary_pos['x'] + other_pos['x']) / 2,
-                'y': (primary_pos['y'] + other_pos['y']) / 2,
-                'z': (primary_pos['z'] + other_pos['z']) / 2
+                'x': location[0],
+                'y': location[1],
+                'z': location[2]
             },
             'distance': distance,
             'safety_buffer': safety_buffer,
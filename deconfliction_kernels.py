@@ -0,0 +1,83 @@
+import numpy as np
+from typing import Tuple
+
+# Numba is optional; without it the kernels fall back to plain NumPy.
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _scenario_violations_numpy(primary_xyz: np.ndarray, other_xyz: np.ndarray,
+                               sampled: np.ndarray,
+                               safety_buffer: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    NumPy reference implementation of `scenario_violations`.
+    """
+    diff = primary_xyz[None, :, :] - other_xyz
+    d2 = (diff * diff).sum(axis=-1)
+
+    # Compare squared distances; only the violations need a sqrt
+    flight_idx, time_idx = np.nonzero((d2 < safety_buffer * safety_buffer) & sampled)
+
+    return flight_idx, time_idx, np.sqrt(d2[flight_idx, time_idx])
+
+
+if NUMBA_AVAILABLE:
+    @njit(fastmath=True, cache=True)
+    def _scenario_violations_numba(primary_xyz, other_xyz, sampled, safety_buffer):
+        m, n = sampled.shape
+        buffer_sq = safety_buffer * safety_buffer
+        flight_idx = np.empty(m * n, dtype=np.int64)
+        time_idx = np.empty(m * n, dtype=np.int64)
+        violations = np.empty(m * n)
+        count = 0
+
+        # Single pass in (flight, time) order; squared distances are compared
+        # and only the violations take a sqrt
+        for j in range(m):
+            for i in range(n):
+                dx = primary_xyz[i, 0] - other_xyz[j, i, 0]
+                dy = primary_xyz[i, 1] - other_xyz[j, i, 1]
+                dz = primary_xyz[i, 2] - other_xyz[j, i, 2]
+                d2 = dx*dx + dy*dy + dz*dz
+                if sampled[j, i] and d2 < buffer_sq:
+                    flight_idx[count] = j
+                    time_idx[count] = i
+                    violations[count] = np.sqrt(d2)
+                    count += 1
+
+        return flight_idx[:count], time_idx[:count], violations[:count]
+
+
+def scenario_violations(primary_xyz: np.ndarray, other_xyz: np.ndarray,
+                        sampled: np.ndarray,
+                        safety_buffer: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find every (flight, time) sample where another drone violates the buffer.
+
+    Args:
+        primary_xyz: (T, 3) primary drone positions on the common time grid
+        other_xyz: (M, T, 3) other drone positions on the same grid
+        sampled: (M, T) mask of the grid times each pair is checked at
+        safety_buffer: Minimum safe distance in meters
+
+    Returns:
+        Tuple of (flight indices, time indices, distances) for the violations
+    """
+    # Compare in the position dtype (float32 for TrajectoryArray data)
+    safety_buffer = primary_xyz.dtype.type(safety_buffer)
+
+    if NUMBA_AVAILABLE:
+        return _scenario_violations_numba(primary_xyz, other_xyz, sampled, safety_buffer)
+
+    return _scenario_violations_numpy(primary_xyz, other_xyz, sampled, safety_buffer)
+
+
+def warm_up():
+    """
+    Trigger JIT compilation with a tiny input so the first real check is fast.
+    """
+    sample = np.zeros((2, 3), dtype=np.float32)
+    scenario_violations(sample, sample[None], np.ones((1, 2), dtype=np.bool_), 1.0)
@@ -0,0 +1,71 @@
+import math
+import numpy as np
+from typing import Tuple
+
+# Numba is optional; without it the kernels fall back to plain NumPy.
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _flight_metrics_numpy(x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                          t: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    NumPy reference implementation of `flight_metrics`.
+    """
+    dx, dy, dz, dt = np.diff(x), np.diff(y), np.diff(z), np.diff(t)
+    segment_distances = np.sqrt(dx*dx + dy*dy + dz*dz)
+
+    # Speed only over segments of positive duration
+    speeds = np.divide(segment_distances, dt, out=np.zeros_like(segment_distances), where=dt > 0)
+
+    return (float(segment_distances.sum()), float(speeds.max(initial=0.0)),
+            float(z.min()), float(z.max()))
+
+
+if NUMBA_AVAILABLE:
+    @njit(fastmath=True, cache=True)
+    def _flight_metrics_kernel(x, y, z, t):
+        total_distance = 0.0
+        max_speed = 0.0
+        min_altitude = z[0]
+        max_altitude = z[0]
+
+        # One pass over the segments for all four reductions
+        for i in range(len(t) - 1):
+            dx = x[i + 1] - x[i]
+            dy = y[i + 1] - y[i]
+            dz = z[i + 1] - z[i]
+            distance = math.sqrt(dx*dx + dy*dy + dz*dz)
+            total_distance += distance
+
+            dt = t[i + 1] - t[i]
+            if dt > 0 and distance / dt > max_speed:
+                max_speed = distance / dt
+
+            min_altitude = min(min_altitude, z[i + 1])
+            max_altitude = max(max_altitude, z[i + 1])
+
+        return total_distance, max_speed, min_altitude, max_altitude
+
+
+def flight_metrics(x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                   t: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    Distance, speed and altitude reductions over a trajectory's segments.
+
+    Args:
+        x, y, z: (N,) float64 positions, N >= 2
+        t: (N,) float64 times
+
+    Returns:
+        Tuple of (total distance, max segment speed, min altitude, max altitude);
+        segments without positive duration do not count towards the speed
+    """
+    if NUMBA_AVAILABLE:
+        total_distance, max_speed, min_altitude, max_altitude = _flight_metrics_kernel(x, y, z, t)
+        return float(total_distance), float(max_speed), float(min_altitude), float(max_altitude)
+
+    return _flight_metrics_numpy(x, y, z, t)
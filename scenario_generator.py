@@ -1,7 +1,33 @@
 import numpy as np
-import random
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Mapping
+from types import MappingProxyType
 from datetime import datetime, timedelta
+from trajectory_calculator import TrajectoryCalculator
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Read-only copy of nested scenario data: dicts become MappingProxyType, lists tuples.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """
+    Mutable copy of `_freeze` output, as plain dicts and lists.
+    """
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    
+    return value
+
 
 class ScenarioGenerator:
     """
@@ -16,10 +42,26 @@ class ScenarioGenerator:
             'z_min': 30, 'z_max': 120
         }
         self.default_mission_duration = 300  # 5 minutes
+        self.rng = np.random.default_rng()
+        self.trajectory_calculator = TrajectoryCalculator()
+        self._scenario_templates: Dict[str, Mapping[str, Any]] = {}
         
-    def generate_scenario(self, scenario_type: str) -> Dict[str, Any]:
+    def generate_scenario(self, scenario_type: str, copy: bool = False) -> Mapping[str, Any]:
         """
         Generate a complete scenario with primary mission and other flights.
+        
+        Predefined scenarios are fixed, so each one is built once and shared
+        afterwards as a read-only template: every nested dict is a
+        MappingProxyType and every list a tuple, so one caller cannot change
+        the scenario for the next.
+        
+        Args:
+            scenario_type: Name of a predefined scenario
+            copy: Return an independent copy as plain dicts and lists instead of
+                the shared template; callers that modify the scenario need it
+            
+        Returns:
+            The scenario, as a read-only mapping unless `copy` is set
         """
         scenarios = {
             'conflict_free': self._generate_conflict_free_scenario,
@@ -29,10 +71,14 @@ class ScenarioGenerator:
             'altitude_conflict': self._generate_altitude_conflict_scenario
         }
         
-        if scenario_type in scenarios:
-            return scenarios[scenario_type]()
-        else:
-            return self._generate_conflict_free_scenario()
+        if scenario_type not in scenarios:
+            scenario_type = 'conflict_free'
+        
+        if scenario_type not in self._scenario_templates:
+            self._scenario_templates[scenario_type] = _freeze(scenarios[scenario_type]())
+        
+        template = self._scenario_templates[scenario_type]
+        return _thaw(template) if copy else template
     
     def create_custom_scenario(self, waypoints: List[Dict], start_time: float, 
                              end_time: float) -> Dict[str, Any]:
@@ -311,27 +357,35 @@ class ScenarioGenerator:
         """
         Generate random background traffic for custom scenarios.
         """
+        bounds = self.airspace_bounds
+        
+        # One batch of draws for all flights, sliced per flight below
+        counts = self.rng.integers(3, 7, size=num_flights)
+        max_waypoints = int(counts.max()) if num_flights else 0
+        coords = self.rng.uniform(
+            [bounds['x_min'], bounds['y_min'], bounds['z_min']],
+            [bounds['x_max'], bounds['y_max'], bounds['z_max']],
+            size=(num_flights, max_waypoints, 3)
+        ).tolist()
+        # Waypoint j is at j times a per-waypoint spacing, as before
+        spacing = self.rng.uniform(60, 120, size=(num_flights, max_waypoints))
+        times = (np.arange(max_waypoints) * spacing).tolist()
+        start_times = self.rng.uniform(-60, 120, size=num_flights).tolist()
+        end_margins = self.rng.uniform(30, 90, size=num_flights).tolist()
+        
         flights = []
         
         for i in range(num_flights):
-            # Random waypoints within airspace
-            num_waypoints = random.randint(3, 6)
-            waypoints = []
-            
-            for j in range(num_waypoints):
-                waypoint = {
-                    'x': random.uniform(self.airspace_bounds['x_min'], self.airspace_bounds['x_max']),
-                    'y': random.uniform(self.airspace_bounds['y_min'], self.airspace_bounds['y_max']),
-                    'z': random.uniform(self.airspace_bounds['z_min'], self.airspace_bounds['z_max']),
-                    'time': j * random.uniform(60, 120)
-                }
-                waypoints.append(waypoint)
+            waypoints = [
+                {'x': x, 'y': y, 'z': z, 'time': t}
+                for (x, y, z), t in zip(coords[i][:counts[i]], times[i][:counts[i]])
+            ]
             
             flight = {
                 'flight_id': f'BG_{i+1:03d}',
                 'waypoints': waypoints,
-                'start_time': random.uniform(-60, 120),
-                'end_time': waypoints[-1]['time'] + random.uniform(30, 90)
+                'start_time': start_times[i],
+                'end_time': waypoints[-1]['time'] + end_margins[i]
             }
             
             flights.append(flight)
@@ -1,7 +1,106 @@
 import numpy as np
-from typing import List, Dict, Tuple
+from dataclasses import dataclass, fields
+from typing import List, Dict, Tuple, Union
 from datetime import datetime, timedelta
-import math
+from functools import lru_cache
+from trajectory_kernels import compute_trajectory, warm_up
+
+@lru_cache(maxsize=64)
+def _sample_times(start_time: float, end_time: float, time_step: float) -> np.ndarray:
+    """
+    Read-only sample grid start_time, start_time + time_step, ... up to end_time.
+    
+    Missions are re-sampled with the same window and step on every rerun, so
+    the grid is built once per (start_time, end_time, time_step).
+    """
+    num_steps = int(np.floor((end_time - start_time) / time_step)) + 1
+    times = start_time + time_step * np.arange(max(num_steps, 0), dtype=np.float64)
+    times = times[times <= end_time]
+    times.flags.writeable = False
+    return times
+
+
+def _waypoint_key(waypoints: List[Dict]) -> Tuple[Tuple, ...]:
+    """
+    Hashable (x, y, z, time) rows for a waypoint list; time is None when absent.
+    """
+    return tuple((wp['x'], wp['y'], wp.get('z', 50.0), wp.get('time')) for wp in waypoints)
+
+
+@lru_cache(maxsize=128)
+def _normalized_waypoint_arrays(waypoint_key: Tuple[Tuple, ...], start_time: float,
+                                end_time: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Read-only (times, x, y, z) arrays of the waypoints normalized to the mission window.
+    
+    The same missions are re-sampled on every rerun and for every step size, so
+    normalization and the array build run once per (waypoints, window).
+    """
+    count = len(waypoint_key)
+    x, y, z = (
+        np.fromiter((row[k] for row in waypoint_key), dtype=np.float64, count=count)
+        for k in range(3)
+    )
+    
+    # When every waypoint has a time and they are not all zero, each maps to
+    # start_time + time / max_time * duration, so the latest lands on end_time;
+    # otherwise the waypoints are spread evenly over the window. Rows are then
+    # stably sorted by time.
+    raw_times = [row[3] for row in waypoint_key]
+    if None not in raw_times and max(raw_times) != 0:
+        times = np.array(raw_times, dtype=np.float64)
+        times = start_time + (times / times.max()) * (end_time - start_time)
+    else:
+        fraction = np.arange(count) / (count - 1) if count > 1 else np.zeros(count)
+        times = start_time + fraction * (end_time - start_time)
+    
+    order = np.argsort(times, kind='stable')
+    arrays = (times[order], x[order], y[order], z[order])
+    for array in arrays:
+        array.flags.writeable = False
+    
+    return arrays
+
+
+@dataclass(eq=False)
+class Trajectory:
+    """
+    Structure-of-arrays trajectory: one array per field, one entry per trajectory point.
+    Field names match the keys of the legacy trajectory point dictionaries.
+    """
+    time: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    z: np.ndarray
+    speed: np.ndarray
+    heading: np.ndarray
+    
+    @classmethod
+    def empty(cls) -> 'Trajectory':
+        return cls(*(np.empty(0) for _ in fields(cls)))
+    
+    @classmethod
+    def from_list_of_dicts(cls, points: List[Dict]) -> 'Trajectory':
+        """
+        Stack legacy trajectory point dictionaries into arrays; missing speed/heading are 0.
+        """
+        return cls(*(
+            np.array([point.get(f.name, 0.0) for point in points], dtype=np.float64)
+            for f in fields(cls)
+        ))
+    
+    def __len__(self) -> int:
+        return len(self.time)
+    
+    def to_list_of_dicts(self) -> List[Dict]:
+        """
+        Compatibility shim for callers that still expect a list of point dictionaries.
+        """
+        names = [f.name for f in fields(self)]
+        columns = [getattr(self, name).tolist() for name in names]
+        
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
 
 class TrajectoryCalculator:
     """
@@ -13,9 +112,12 @@ class TrajectoryCalculator:
         self.default_speed = 15.0  # m/s
         self.max_speed = 30.0      # m/s
         self.min_speed = 5.0       # m/s
+        
+        # Compile the trajectory kernel up front rather than on the first mission
+        warm_up()
     
     def calculate_trajectory(self, waypoints: List[Dict], start_time: float, 
-                           end_time: float, time_step: int = 5) -> List[Dict]:
+                           end_time: float, time_step: int = 5) -> Trajectory:
         """
         Calculate complete trajectory from waypoints with temporal information.
         
@@ -26,221 +128,100 @@ class TrajectoryCalculator:
             time_step: Time discretization step in seconds
             
         Returns:
-            List of trajectory points with positions and timing
+            Trajectory with positions, speed and heading at each time step
         """
         if not waypoints or len(waypoints) < 2:
-            return []
-        
-        # Normalize waypoint times to mission window
-        normalized_waypoints = self._normalize_waypoint_times(waypoints, start_time, end_time)
-        
-        # Generate trajectory points
-        trajectory_points = []
-        current_time = start_time
-        
-        while current_time <= end_time:
-            position = self._interpolate_position_at_time(normalized_waypoints, current_time)
-            if position:
-                trajectory_point = {
-                    'time': current_time,
-                    'x': position['x'],
-                    'y': position['y'],
-                    'z': position['z'],
-                    'speed': self._calculate_speed_at_time(normalized_waypoints, current_time),
-                    'heading': self._calculate_heading_at_time(normalized_waypoints, current_time)
-                }
-                trajectory_points.append(trajectory_point)
-            
-            current_time += time_step
+            return Trajectory.empty()
         
-        # Ensure end waypoint is included
-        if trajectory_points and trajectory_points[-1]['time'] < end_time:
-            final_position = normalized_waypoints[-1]
-            trajectory_points.append({
-                'time': end_time,
-                'x': final_position['x'],
-                'y': final_position['y'],
-                'z': final_position['z'],
-                'speed': 0.0,
-                'heading': trajectory_points[-1]['heading'] if trajectory_points else 0.0
-            })
-        
-        return trajectory_points
-    
-    def _normalize_waypoint_times(self, waypoints: List[Dict], start_time: float, 
-                                end_time: float) -> List[Dict]:
-        """
-        Normalize waypoint times to fit within mission time window.
-        """
-        if not waypoints:
-            return []
-        
-        normalized = []
-        mission_duration = end_time - start_time
-        
-        # If waypoints have explicit times, use them
-        if all('time' in wp for wp in waypoints):
-            for wp in waypoints:
-                normalized_time = start_time + (wp['time'] / max(wp['time'] for wp in waypoints)) * mission_duration
-                normalized.append({
-                    'x': wp['x'],
-                    'y': wp['y'],
-                    'z': wp.get('z', 50.0),
-                    'time': normalized_time
-                })
-        else:
-            # Distribute waypoints evenly across mission duration
-            for i, wp in enumerate(waypoints):
-                time_fraction = i / (len(waypoints) - 1) if len(waypoints) > 1 else 0
-                normalized_time = start_time + time_fraction * mission_duration
-                normalized.append({
-                    'x': wp['x'],
-                    'y': wp['y'],
-                    'z': wp.get('z', 50.0),
-                    'time': normalized_time
-                })
-        
-        return sorted(normalized, key=lambda x: x['time'])
-    
-    def _interpolate_position_at_time(self, waypoints: List[Dict], target_time: float) -> Dict:
-        """
-        Interpolate drone position at specific time using waypoints.
-        """
-        if not waypoints:
-            return None
-        
-        # Handle edge cases
-        if target_time <= waypoints[0]['time']:
-            return waypoints[0]
-        if target_time >= waypoints[-1]['time']:
-            return waypoints[-1]
-        
-        # Find surrounding waypoints
-        for i in range(len(waypoints) - 1):
-            wp1, wp2 = waypoints[i], waypoints[i + 1]
-            
-            if wp1['time'] <= target_time <= wp2['time']:
-                # Linear interpolation
-                time_ratio = (target_time - wp1['time']) / (wp2['time'] - wp1['time'])
-                
-                return {
-                    'x': wp1['x'] + time_ratio * (wp2['x'] - wp1['x']),
-                    'y': wp1['y'] + time_ratio * (wp2['y'] - wp1['y']),
-                    'z': wp1['z'] + time_ratio * (wp2['z'] - wp1['z']),
-                    'time': target_time
-                }
-        
-        return waypoints[-1]
-    
-    def _calculate_speed_at_time(self, waypoints: List[Dict], target_time: float) -> float:
-        """
-        Calculate drone speed at specific time.
-        """
-        if len(waypoints) < 2:
-            return 0.0
+        # Waypoint table normalized to the mission window, built once per mission
+        wp_t, wp_x, wp_y, wp_z = _normalized_waypoint_arrays(
+            _waypoint_key(waypoints), start_time, end_time
+        )
         
-        # Find current segment
-        for i in range(len(waypoints) - 1):
-            wp1, wp2 = waypoints[i], waypoints[i + 1]
-            
-            if wp1['time'] <= target_time <= wp2['time']:
-                distance = math.sqrt(
-                    (wp2['x'] - wp1['x'])**2 + 
-                    (wp2['y'] - wp1['y'])**2 + 
-                    (wp2['z'] - wp1['z'])**2
-                )
-                time_diff = wp2['time'] - wp1['time']
-                
-                if time_diff > 0:
-                    speed = distance / time_diff
-                    return max(self.min_speed, min(self.max_speed, speed))
-        
-        return self.default_speed
-    
-    def _calculate_heading_at_time(self, waypoints: List[Dict], target_time: float) -> float:
-        """
-        Calculate drone heading (direction of travel) at specific time.
-        """
-        if len(waypoints) < 2:
-            return 0.0
+        # Sample times start_time, start_time + time_step, ... up to end_time
+        times = _sample_times(start_time, end_time, time_step)
+        if len(times) == 0:
+            return Trajectory.empty()
         
-        # Find current segment
-        for i in range(len(waypoints) - 1):
-            wp1, wp2 = waypoints[i], waypoints[i + 1]
-            
-            if wp1['time'] <= target_time <= wp2['time']:
-                dx = wp2['x'] - wp1['x']
-                dy = wp2['y'] - wp1['y']
-                
-                heading = math.atan2(dy, dx) * 180 / math.pi
-                return heading
-        
-        return 0.0
+        # Positions, speeds and headings in one kernel call
+        x, y, z, speed, heading = compute_trajectory(
+            wp_t, wp_x, wp_y, wp_z, times,
+            self.min_speed, self.max_speed, self.default_speed
+        )
+        
+        # Ensure end waypoint is included
+        if len(times) and times[-1] < end_time:
+            times = np.append(times, end_time)
+            x, y, z = np.append(x, wp_x[-1]), np.append(y, wp_y[-1]), np.append(z, wp_z[-1])
+            speed = np.append(speed, 0.0)
+            heading = np.append(heading, heading[-1])
+        
+        # The cached grid is shared and read-only; the trajectory gets its own copy
+        return Trajectory(times.copy(), x, y, z, speed, heading)
     
-    def calculate_trajectory_metrics(self, trajectory: List[Dict]) -> Dict:
+    def calculate_trajectory_metrics(self, trajectory: Union[Trajectory, List[Dict]]) -> Dict:
         """
         Calculate various metrics for a trajectory.
         """
-        if not trajectory:
+        if not isinstance(trajectory, Trajectory):
+            trajectory = Trajectory.from_list_of_dicts(trajectory)
+        
+        if len(trajectory) == 0:
             return {}
         
-        total_distance = 0.0
-        max_speed = 0.0
-        avg_altitude = 0.0
+        xyz = np.column_stack((trajectory.x, trajectory.y, trajectory.z))
+        segment_distances = np.linalg.norm(np.diff(xyz, axis=0), axis=1)
+        total_distance = float(segment_distances.sum())
         
-        for i in range(len(trajectory) - 1):
-            p1, p2 = trajectory[i], trajectory[i + 1]
-            segment_distance = math.sqrt(
-                (p2['x'] - p1['x'])**2 + 
-                (p2['y'] - p1['y'])**2 + 
-                (p2['z'] - p1['z'])**2
-            )
-            total_distance += segment_distance
-            max_speed = max(max_speed, p1.get('speed', 0))
+        # Speed of every point that starts a segment
+        max_speed = float(max(0.0, trajectory.speed[:-1].max(initial=0.0)))
         
-        avg_altitude = sum(p['z'] for p in trajectory) / len(trajectory)
+        avg_altitude = float(trajectory.z.mean())
         
         return {
             'total_distance': total_distance,
             'max_speed': max_speed,
             'average_altitude': avg_altitude,
-            'duration': trajectory[-1]['time'] - trajectory[0]['time'],
+            'duration': float(trajectory.time[-1] - trajectory.time[0]),
             'total_points': len(trajectory)
         }
     
-    def smooth_trajectory(self, trajectory: List[Dict], smoothing_factor: float = 0.1) -> List[Dict]:
+    def smooth_trajectory(self, trajectory: Union[Trajectory, List[Dict]], 
+                          smoothing_factor: float = 0.1) -> Union[Trajectory, List[Dict]]:
         """
         Apply smoothing to trajectory to reduce sharp turns.
         """
         if len(trajectory) < 3:
             return trajectory
         
-        smoothed = [trajectory[0]]  # Keep first point unchanged
-        
-        for i in range(1, len(trajectory) - 1):
-            prev_point = trajectory[i - 1]
-            curr_point = trajectory[i]
-            next_point = trajectory[i + 1]
-            
-            # Apply exponential smoothing
-            smoothed_x = curr_point['x'] + smoothing_factor * (
-                (prev_point['x'] + next_point['x']) / 2 - curr_point['x']
-            )
-            smoothed_y = curr_point['y'] + smoothing_factor * (
-                (prev_point['y'] + next_point['y']) / 2 - curr_point['y']
-            )
-            smoothed_z = curr_point['z'] + smoothing_factor * (
-                (prev_point['z'] + next_point['z']) / 2 - curr_point['z']
+        if isinstance(trajectory, Trajectory):
+            xyz = self._smooth_positions(
+                np.column_stack((trajectory.x, trajectory.y, trajectory.z)), smoothing_factor
             )
-            
-            smoothed_point = curr_point.copy()
-            smoothed_point.update({
-                'x': smoothed_x,
-                'y': smoothed_y,
-                'z': smoothed_z
-            })
-            
-            smoothed.append(smoothed_point)
+            return Trajectory(trajectory.time.copy(), xyz[:, 0], xyz[:, 1], xyz[:, 2],
+                              trajectory.speed.copy(), trajectory.heading.copy())
+        
+        # Legacy point lists: stack once, smooth, then rebuild the interior points
+        xyz = self._smooth_positions(
+            np.array([(point['x'], point['y'], point['z']) for point in trajectory],
+                     dtype=np.float64),
+            smoothing_factor
+        )
         
+        smoothed = [trajectory[0]]  # Keep first point unchanged
+        for point, (x, y, z) in zip(trajectory[1:-1], xyz[1:-1].tolist()):
+            smoothed_point = point.copy()
+            smoothed_point.update({'x': x, 'y': y, 'z': z})
+            smoothed.append(smoothed_point)
         smoothed.append(trajectory[-1])  # Keep last point unchanged
+        
+        return smoothed
+    
+    def _smooth_positions(self, xyz: np.ndarray, smoothing_factor: float) -> np.ndarray:
+        """
+        Pull each interior (N, 3) position towards the midpoint of its neighbours.
+        """
+        smoothed = xyz.copy()
+        smoothed[1:-1] += smoothing_factor * ((xyz[:-2] + xyz[2:]) / 2 - xyz[1:-1])
+        
         return smoothed
@@ -0,0 +1,165 @@
+import math
+import numpy as np
+from typing import Tuple
+
+# Numba is optional; without it the kernels fall back to plain NumPy.
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _compute_trajectory_numpy(wp_t: np.ndarray, wp_x: np.ndarray, wp_y: np.ndarray,
+                              wp_z: np.ndarray, times: np.ndarray, min_speed: float,
+                              max_speed: float, default_speed: float) -> Tuple[np.ndarray, ...]:
+    """
+    NumPy reference implementation of `compute_trajectory`.
+    """
+    last = len(wp_t) - 1
+
+    # Per-segment quantities, each derived once from the waypoint deltas
+    seg_dt = np.diff(wp_t)
+    seg_d = np.column_stack((np.diff(wp_x), np.diff(wp_y), np.diff(wp_z)))
+    dx, dy, dz = seg_d.T
+    moving = seg_dt > 0
+    seg_speed = np.linalg.norm(seg_d, axis=1)
+    np.divide(seg_speed, seg_dt, out=seg_speed, where=moving)
+    np.clip(seg_speed, min_speed, max_speed, out=seg_speed)
+    seg_speed[~moving] = default_speed
+    seg_heading = np.arctan2(dy, dx) * 180 / np.pi
+
+    # One table row per segment, gathered once per sample:
+    # t0, dt, x0, y0, z0, dx, dy, dz, speed, heading
+    table = np.column_stack((wp_t[:-1], seg_dt, wp_x[:-1], wp_y[:-1], wp_z[:-1],
+                             seg_d, seg_speed, seg_heading))
+
+    # Segment lookup: wp_t[seg] < t <= wp_t[seg + 1] for times inside the waypoints
+    seg = np.clip(np.searchsorted(wp_t, times, side='left') - 1, 0, last - 1)
+    rows = table[seg]
+    in_range = (times >= wp_t[0]) & (times <= wp_t[-1])
+    inside = (times > wp_t[0]) & (times < wp_t[-1])
+
+    # Interpolated positions, clamped to the first/last waypoint outside
+    ratio = np.divide(times - rows[:, 0], rows[:, 1], out=np.zeros_like(times), where=inside)
+    xyz = rows[:, 2:5] + ratio[:, None] * rows[:, 5:8]
+    xyz = np.where(inside[:, None], xyz,
+                   np.where((times <= wp_t[0])[:, None],
+                            [wp_x[0], wp_y[0], wp_z[0]], [wp_x[-1], wp_y[-1], wp_z[-1]]))
+
+    speed = np.where(in_range, rows[:, 8], default_speed)
+    heading = np.where(in_range, rows[:, 9], 0.0)
+
+    # At t == wp_t[0] the speed comes from the first segment of positive
+    # duration, which starts at the last waypoint sharing the first time
+    first_seg = int(np.searchsorted(wp_t, wp_t[0], side='right')) - 1
+    speed[times == wp_t[0]] = seg_speed[first_seg] if first_seg < last else default_speed
+
+    return xyz[:, 0], xyz[:, 1], xyz[:, 2], speed, heading
+
+
+if NUMBA_AVAILABLE:
+    @njit(fastmath=True, cache=True)
+    def _compute_trajectory_kernel(wp_t, wp_x, wp_y, wp_z, times, min_speed, max_speed,
+                                   default_speed):
+        n = len(times)
+        last = len(wp_t) - 1
+        x = np.empty(n)
+        y = np.empty(n)
+        z = np.empty(n)
+        speed = np.empty(n)
+        heading = np.empty(n)
+
+        # Per-segment speed and heading
+        seg_speed = np.empty(last)
+        seg_heading = np.empty(last)
+        for k in range(last):
+            dx = wp_x[k + 1] - wp_x[k]
+            dy = wp_y[k + 1] - wp_y[k]
+            dz = wp_z[k + 1] - wp_z[k]
+            dt = wp_t[k + 1] - wp_t[k]
+            seg_speed[k] = 0.0
+            if dt > 0:
+                seg_speed[k] = min(max(math.sqrt(dx*dx + dy*dy + dz*dz) / dt, min_speed), max_speed)
+            seg_heading[k] = math.atan2(dy, dx) * 180 / math.pi
+
+        # Times are sorted, so the segment pointer only moves forward
+        seg = 0
+        for i in range(n):
+            t = times[i]
+
+            if t < wp_t[0] or t > wp_t[last]:
+                # Outside the waypoints: clamp the position, no segment
+                k = 0 if t < wp_t[0] else last
+                x[i] = wp_x[k]
+                y[i] = wp_y[k]
+                z[i] = wp_z[k]
+                speed[i] = default_speed
+                heading[i] = 0.0
+                continue
+
+            if t == wp_t[0]:
+                x[i] = wp_x[0]
+                y[i] = wp_y[0]
+                z[i] = wp_z[0]
+                heading[i] = seg_heading[0]
+
+                # First segment of positive duration starting at the first waypoint time
+                k = 0
+                while k < last - 1 and wp_t[k + 1] == t:
+                    k += 1
+                speed[i] = seg_speed[k] if wp_t[k + 1] > t else default_speed
+                continue
+
+            while seg < last - 1 and wp_t[seg + 1] < t:
+                seg += 1
+
+            # wp_t[seg] < t <= wp_t[seg + 1]
+            if t < wp_t[last]:
+                ratio = (t - wp_t[seg]) / (wp_t[seg + 1] - wp_t[seg])
+                x[i] = wp_x[seg] + ratio * (wp_x[seg + 1] - wp_x[seg])
+                y[i] = wp_y[seg] + ratio * (wp_y[seg + 1] - wp_y[seg])
+                z[i] = wp_z[seg] + ratio * (wp_z[seg + 1] - wp_z[seg])
+            else:
+                x[i] = wp_x[last]
+                y[i] = wp_y[last]
+                z[i] = wp_z[last]
+            speed[i] = seg_speed[seg]
+            heading[i] = seg_heading[seg]
+
+        return x, y, z, speed, heading
+
+
+def compute_trajectory(wp_t: np.ndarray, wp_x: np.ndarray, wp_y: np.ndarray,
+                       wp_z: np.ndarray, times: np.ndarray, min_speed: float,
+                       max_speed: float, default_speed: float) -> Tuple[np.ndarray, ...]:
+    """
+    Evaluate position, speed and heading at each sample time.
+
+    Args:
+        wp_t: (W,) sorted waypoint times, W >= 2
+        wp_x, wp_y, wp_z: (W,) waypoint coordinates
+        times: (N,) sorted sample times
+        min_speed, max_speed: Speed clamp in m/s
+        default_speed: Speed outside the waypoint time window
+
+    Returns:
+        Tuple of (x, y, z, speed, heading) arrays of length N
+    """
+    if NUMBA_AVAILABLE:
+        return _compute_trajectory_kernel(wp_t, wp_x, wp_y, wp_z, times,
+                                          float(min_speed), float(max_speed),
+                                          float(default_speed))
+
+    return _compute_trajectory_numpy(wp_t, wp_x, wp_y, wp_z, times,
+                                     min_speed, max_speed, default_speed)
+
+
+def warm_up():
+    """
+    Trigger JIT compilation with a tiny input so the first real trajectory is fast.
+    """
+    # Read-only, like the cached waypoint arrays and sample grids it is called with
+    sample = np.array([0.0, 1.0])
+    sample.flags.writeable = False
+    compute_trajectory(sample, sample, sample, sample, sample, 1.0, 2.0, 1.0)
@@ -1,33 +1,205 @@
 import math
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple, Union
 from datetime import datetime, timedelta
+from metrics_kernels import flight_metrics
 
-def calculate_distance_3d(pos1: Dict, pos2: Dict) -> float:
+# SciPy is optional; without it conflict tree queries scan each time window.
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+def calculate_distance_3d(pos1: Union[Dict, np.ndarray], pos2: Union[Dict, np.ndarray]) -> Union[float, np.ndarray]:
     """
     Calculate 3D Euclidean distance between two positions.
     
     Args:
-        pos1: Dictionary with x, y, z coordinates
-        pos2: Dictionary with x, y, z coordinates
+        pos1: Dictionary with x, y, z coordinates, or an (..., 3) array
+        pos2: Dictionary with x, y, z coordinates, or an (..., 3) array
         
     Returns:
-        Distance in meters
+        Distance in meters (an array of distances for array input)
+    """
+    if isinstance(pos1, np.ndarray) or isinstance(pos2, np.ndarray):
+        return np.linalg.norm(np.asarray(pos1) - np.asarray(pos2), axis=-1)
+    
+    return math.dist((pos1['x'], pos1['y'], pos1['z']), (pos2['x'], pos2['y'], pos2['z']))
+
+def calculate_squared_distance_3d(pos1: Union[Dict, np.ndarray], pos2: Union[Dict, np.ndarray]) -> Union[float, np.ndarray]:
+    """
+    Calculate squared 3D Euclidean distance between two positions.
+    
+    Cheaper than `calculate_distance_3d` for threshold checks: compare against
+    the squared threshold and only take the square root when reporting.
     """
+    if isinstance(pos1, np.ndarray) or isinstance(pos2, np.ndarray):
+        diff = np.asarray(pos1) - np.asarray(pos2)
+        return (diff * diff).sum(axis=-1)
+    
     dx = pos1['x'] - pos2['x']
     dy = pos1['y'] - pos2['y']
     dz = pos1['z'] - pos2['z']
     
-    return math.sqrt(dx*dx + dy*dy + dz*dz)
+    return dx*dx + dy*dy + dz*dz
+
+def to_soa(points: Union[List[Dict], Dict[str, np.ndarray]], 
+           dtype=np.float32) -> Dict[str, np.ndarray]:
+    """
+    Structure-of-arrays form of a list of position dictionaries.
+    
+    Args:
+        points: List of dictionaries with x, y, z and time, or an existing
+            structure-of-arrays dictionary (returned unchanged)
+        dtype: Coordinate dtype; times are always float64
+        
+    Returns:
+        Dictionary of 'x', 'y', 'z' and 'time' arrays, one entry per point
+    """
+    if isinstance(points, dict):
+        return points
+    
+    soa = {
+        key: np.fromiter((p[key] for p in points), dtype=dtype, count=len(points))
+        for key in ('x', 'y', 'z')
+    }
+    soa['time'] = np.fromiter((p['time'] for p in points), dtype=np.float64, count=len(points))
+    
+    return soa
+
+# Point list id -> (list, read-only (N, 3) array); the list is kept so its id stays unique
+_xyz_cache: Dict[int, Tuple[List[Dict], np.ndarray]] = {}
+
+def _as_xyz(points: Union[List[Dict], np.ndarray]) -> np.ndarray:
+    """
+    (N, 3) position array from a list of position dictionaries (as float32) or an array.
+    
+    A list is converted once and the read-only result reused while the same
+    list is passed again, so point lists must not be edited after their first use.
+    """
+    if isinstance(points, np.ndarray):
+        return points
+    
+    cached = _xyz_cache.pop(id(points), None)
+    if cached is None or cached[0] is not points:
+        # Filled column by column from preallocated generators, without tuple temporaries
+        xyz = np.empty((len(points), 3), dtype=np.float32)
+        for axis, key in enumerate(('x', 'y', 'z')):
+            xyz[:, axis] = np.fromiter((p[key] for p in points), dtype=np.float32, count=len(points))
+        xyz.flags.writeable = False
+        cached = (points, xyz)
+    
+    # Most recently used last; the oldest list is dropped beyond 16
+    _xyz_cache[id(points)] = cached
+    if len(_xyz_cache) > 16:
+        del _xyz_cache[next(iter(_xyz_cache))]
+    
+    return cached[1]
+
+def distances_3d(points1: Union[List[Dict], np.ndarray], 
+                 points2: Union[List[Dict], np.ndarray]) -> np.ndarray:
+    """
+    Row-wise 3D distances between two equally long sets of positions.
+    
+    Args:
+        points1: (N, 3) positions or a list of N position dictionaries
+        points2: (N, 3) positions or a list of N position dictionaries
+        
+    Returns:
+        (N,) distances in meters
+    """
+    diff = _as_xyz(points1) - _as_xyz(points2)
+    return np.sqrt((diff * diff).sum(axis=-1))
+
+def build_conflict_tree(other_trajectories: List[Dict]) -> Dict[str, Any]:
+    """
+    Spatial index over all other flights' trajectory points, built once and
+    queried with `query_conflict_tree` for any primary trajectory.
+    
+    Args:
+        other_trajectories: List of {'trajectory': ..., 'flight_id': ...} entries;
+            each trajectory is a point list or its structure-of-arrays form
+        
+    Returns:
+        Dictionary with 'xyz' ((N, 3) positions in time order), 'times' ((N,)
+        sorted times), 'flight_ids' ((N,) flight id of each point) and 'tree'
+        (cKDTree over 'xyz', or None without SciPy)
+    """
+    xyz, times, flight_ids = [], [], []
+    
+    for traj_data in other_trajectories:
+        trajectory = to_soa(traj_data['trajectory'])
+        xyz.append(np.column_stack((trajectory['x'], trajectory['y'], trajectory['z'])))
+        times.append(trajectory['time'])
+        flight_ids.append(np.full(len(trajectory['time']), traj_data['flight_id'], dtype=object))
+    
+    if not times:
+        return {'xyz': np.empty((0, 3), dtype=np.float32), 'times': np.empty(0),
+                'flight_ids': np.empty(0, dtype=object), 'tree': None}
+    
+    # Time order lets a query turn its time window into an index range
+    times = np.concatenate(times)
+    order = np.argsort(times, kind='stable')
+    xyz = np.concatenate(xyz)[order]
+    
+    return {
+        'xyz': xyz,
+        'times': times[order],
+        'flight_ids': np.concatenate(flight_ids)[order],
+        'tree': cKDTree(xyz) if cKDTree is not None and len(xyz) else None
+    }
+
+def query_conflict_tree(index: Dict[str, Any], 
+                        primary_trajectory: Union[List[Dict], Dict[str, np.ndarray]], 
+                        safety_buffer: float, 
+                        time_tolerance: float = 0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find every pair of primary and indexed points closer than the safety buffer
+    and at most `time_tolerance` seconds apart.
+    
+    Args:
+        index: Index from `build_conflict_tree`
+        primary_trajectory: Point list or its structure-of-arrays form
+        safety_buffer: Minimum safe distance in meters
+        time_tolerance: Maximum time difference in seconds for a pair to count
+        
+    Returns:
+        Tuple of (primary point indices, index point indices, distances),
+        ordered by primary point
+    """
+    primary = to_soa(primary_trajectory)
+    primary_xyz = np.column_stack((primary['x'], primary['y'], primary['z']))
+    
+    # Each primary point's time window as a range of the time-sorted index
+    lo = np.searchsorted(index['times'], primary['time'] - time_tolerance, side='left')
+    hi = np.searchsorted(index['times'], primary['time'] + time_tolerance, side='right')
+    
+    if index['tree'] is not None:
+        neighbours = index['tree'].query_ball_point(primary_xyz, r=safety_buffer, workers=-1)
+    else:
+        neighbours = [range(lo[i], hi[i]) for i in range(len(primary_xyz))]
+    
+    primary_idx, other_idx = [], []
+    for i, candidates in enumerate(neighbours):
+        candidates = np.asarray(candidates, dtype=np.int64)
+        candidates = candidates[(candidates >= lo[i]) & (candidates < hi[i])]
+        primary_idx.append(np.full(len(candidates), i, dtype=np.int64))
+        other_idx.append(np.sort(candidates))
+    
+    primary_idx = np.concatenate(primary_idx) if primary_idx else np.empty(0, dtype=np.int64)
+    other_idx = np.concatenate(other_idx) if other_idx else np.empty(0, dtype=np.int64)
+    
+    # The tree's ball includes its boundary; conflicts need strictly less
+    distances = distances_3d(primary_xyz[primary_idx], index['xyz'][other_idx])
+    inside = distances < safety_buffer
+    
+    return primary_idx[inside], other_idx[inside], distances[inside]
 
 def calculate_distance_2d(pos1: Dict, pos2: Dict) -> float:
     """
     Calculate 2D distance between two positions (ignoring altitude).
     """
-    dx = pos1['x'] - pos2['x']
-    dy = pos1['y'] - pos2['y']
-    
-    return math.sqrt(dx*dx + dy*dy)
+    return math.hypot(pos1['x'] - pos2['x'], pos1['y'] - pos2['y'])
 
 def interpolate_position(pos1: Dict, pos2: Dict, target_time: float) -> Dict:
     """
@@ -55,6 +227,26 @@ def interpolate_position(pos1: Dict, pos2: Dict, target_time: float) -> Dict:
         'time': target_time
     }
 
+def downsample_for_plot(xyz: np.ndarray, times: np.ndarray, 
+                        max_points: int = 2000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a trajectory to at most `max_points` evenly strided samples for plotting.
+    
+    Args:
+        xyz: (N, 3) positions
+        times: (N,) sample times
+        max_points: Maximum number of samples to keep
+        
+    Returns:
+        Tuple of (positions, times); the first and last samples are always kept
+    """
+    if len(times) <= max_points:
+        return xyz, times
+    
+    indices = np.linspace(0, len(times) - 1, max_points).astype(int)
+    
+    return xyz[indices], times[indices]
+
 def validate_waypoints(waypoints: List[Dict]) -> bool:
     """
     Validate waypoint data structure and values.
@@ -68,27 +260,18 @@ def validate_waypoints(waypoints: List[Dict]) -> bool:
     if not waypoints or len(waypoints) < 2:
         return False
     
-    required_fields = ['x', 'y', 'z']
+    # Missing fields or values that do not convert to float are invalid
+    try:
+        coords = np.array([(wp['x'], wp['y'], wp['z']) for wp in waypoints], dtype=np.float64)
+    except (KeyError, ValueError, TypeError):
+        return False
     
-    for wp in waypoints:
-        # Check required fields
-        if not all(field in wp for field in required_fields):
-            return False
-        
-        # Check data types and reasonable ranges
-        try:
-            x, y, z = float(wp['x']), float(wp['y']), float(wp['z'])
-            
-            # Basic range validation
-            if abs(x) > 10000 or abs(y) > 10000:  # Reasonable coordinate limits
-                return False
-            if z < 0 or z > 1000:  # Altitude limits
-                return False
-                
-        except (ValueError, TypeError):
-            return False
-    
-    return True
+    # Basic range validation: reasonable coordinate and altitude limits
+    # (NaN, e.g. from a None value, fails both)
+    within_bounds = np.abs(coords[:, :2]) <= 10000
+    within_altitude = (coords[:, 2] >= 0) & (coords[:, 2] <= 1000)
+    
+    return bool(within_bounds.all() and within_altitude.all())
 
 def format_time(seconds: float) -> str:
     """
@@ -100,16 +283,13 @@ def format_time(seconds: float) -> str:
     Returns:
         Formatted time string
     """
-    if seconds < 0:
-        return f"-{format_time(-seconds)}"
-    
-    minutes = int(seconds // 60)
-    remaining_seconds = int(seconds % 60)
+    sign = "-" if seconds < 0 else ""
+    minutes, remaining_seconds = divmod(int(abs(seconds)), 60)
     
     if minutes > 0:
-        return f"{minutes}m {remaining_seconds}s"
+        return f"{sign}{minutes}m {remaining_seconds}s"
     else:
-        return f"{remaining_seconds}s"
+        return f"{sign}{remaining_seconds}s"
 
 def calculate_bearing(pos1: Dict, pos2: Dict) -> float:
     """
@@ -130,47 +310,29 @@ def calculate_bearing(pos1: Dict, pos2: Dict) -> float:
     # Convert to 0-360 range
     return (bearing + 360) % 360
 
-def calculate_flight_metrics(trajectory: List[Dict]) -> Dict[str, Any]:
+def calculate_flight_metrics(trajectory: Union[List[Dict], Dict[str, np.ndarray]]) -> Dict[str, Any]:
     """
     Calculate various metrics for a flight trajectory.
     
     Args:
-        trajectory: List of trajectory points
+        trajectory: List of trajectory points, or their structure-of-arrays form
         
     Returns:
         Dictionary with calculated metrics
     """
-    if not trajectory or len(trajectory) < 2:
+    soa = to_soa(trajectory, dtype=np.float64)
+    num_points = len(soa['time'])
+    if num_points < 2:
         return {}
     
-    total_distance = 0.0
-    max_speed = 0.0
-    min_altitude = float('inf')
-    max_altitude = float('-inf')
-    
-    for i in range(len(trajectory) - 1):
-        p1, p2 = trajectory[i], trajectory[i + 1]
-        
-        # Distance calculation
-        segment_distance = calculate_distance_3d(p1, p2)
-        total_distance += segment_distance
-        
-        # Speed calculation
-        time_diff = p2['time'] - p1['time']
-        if time_diff > 0:
-            speed = segment_distance / time_diff
-            max_speed = max(max_speed, speed)
-        
-        # Altitude tracking
-        min_altitude = min(min_altitude, p1['z'])
-        max_altitude = max(max_altitude, p1['z'])
+    x, y, z, times = (
+        np.ascontiguousarray(soa[key], dtype=np.float64) for key in ('x', 'y', 'z', 'time')
+    )
     
-    # Include last point altitude
-    if trajectory:
-        min_altitude = min(min_altitude, trajectory[-1]['z'])
-        max_altitude = max(max_altitude, trajectory[-1]['z'])
+    # Every segment in one kernel pass
+    total_distance, max_speed, min_altitude, max_altitude = flight_metrics(x, y, z, times)
     
-    duration = trajectory[-1]['time'] - trajectory[0]['time']
+    duration = float(times[-1] - times[0])
     avg_speed = total_distance / duration if duration > 0 else 0
     
     return {
@@ -181,7 +343,7 @@ def calculate_flight_metrics(trajectory: List[Dict]) -> Dict[str, Any]:
         'min_altitude': min_altitude,
         'max_altitude': max_altitude,
         'altitude_range': max_altitude - min_altitude,
-        'total_waypoints': len(trajectory)
+        'total_waypoints': num_points
     }
 
 def generate_safety_buffer_recommendations(conflicts: List[Dict]) -> List[Dict]:
@@ -204,13 +366,17 @@ def generate_safety_buffer_recommendations(conflicts: List[Dict]) -> List[Dict]:
         })
         return recommendations
     
-    # Analyze conflict distances
-    min_distance = min(c['distance'] for c in conflicts)
-    avg_distance = sum(c['distance'] for c in conflicts) / len(conflicts)
+    # Closest approach and high severity presence in one pass
+    min_distance = math.inf
+    has_high_severity = False
+    for c in conflicts:
+        if c['distance'] < min_distance:
+            min_distance = c['distance']
+        if c['severity'] == 'HIGH':
+            has_high_severity = True
     
     # High severity conflicts
-    high_severity_conflicts = [c for c in conflicts if c['severity'] == 'HIGH']
-    if high_severity_conflicts:
+    if has_high_severity:
         recommended_buffer = min_distance * 2.5
         recommendations.append({
             'type': 'increase',
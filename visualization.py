@@ -1,8 +1,51 @@
 import plotly.graph_objects as go
 import plotly.express as px
 import numpy as np
-from typing import List, Dict, Any
-import pandas as pd
+from typing import List, Dict, Any, Tuple, Union
+from utils import to_soa
+
+def merge_other_traces(other_trajectories: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Concatenate all other flights into flat arrays for a single Plotly trace.
+    
+    Flights are separated by a NaN point so their lines are not joined.
+    
+    Args:
+        other_trajectories: List of {'trajectory': ..., 'flight_id': ...} entries;
+            each trajectory is a point list or its structure-of-arrays form
+        
+    Returns:
+        Dictionary of per-point 'x', 'y', 'z', 'time', 'flight_code' (index of
+        the flight, for marker colors) and 'flight_id' (for hover) arrays
+    """
+    parts = {key: [] for key in ('x', 'y', 'z', 'time', 'flight_code', 'flight_id')}
+    
+    for code, traj_data in enumerate(other_trajectories):
+        trajectory = to_soa(traj_data['trajectory'])
+        num_points = len(trajectory['time'])
+        if num_points == 0:
+            continue
+        
+        for key in ('x', 'y', 'z', 'time'):
+            parts[key].extend((trajectory[key], [np.nan]))
+        parts['flight_code'].append(np.full(num_points + 1, code))
+        parts['flight_id'].append([traj_data['flight_id']] * num_points + [None])
+    
+    # Coordinates as float32 (cm precision at airspace scale), times as float64
+    if not parts['time']:
+        merged = {key: np.empty(0, dtype=np.float32) for key in ('x', 'y', 'z')}
+        merged['time'] = np.empty(0)
+        merged['flight_code'] = np.empty(0, dtype=int)
+        merged['flight_id'] = np.empty(0, dtype=object)
+        return merged
+    
+    merged = {key: np.concatenate(parts[key]).astype(np.float32) for key in ('x', 'y', 'z')}
+    merged['time'] = np.concatenate(parts['time']).astype(np.float64)
+    merged['flight_code'] = np.concatenate(parts['flight_code'])
+    merged['flight_id'] = np.array([fid for ids in parts['flight_id'] for fid in ids], dtype=object)
+    
+    return merged
+
 
 class VisualizationManager:
     """
@@ -20,22 +63,114 @@ class VisualizationManager:
             'zone': '#e377c2'         # Pink
         }
         
-    def create_airspace_plot(self, primary_trajectory: List[Dict], 
+        # Unit sphere and circle vertices, scaled and translated for each conflict zone
+        phi, theta = np.mgrid[0:np.pi:20j, 0:2*np.pi:20j]
+        self._unit_sphere = tuple(
+            axis.ravel().astype(np.float32)
+            for axis in (np.sin(phi) * np.cos(theta), np.sin(phi) * np.sin(theta), np.cos(phi))
+        )
+        
+        # Two triangles per grid cell, as vertex indices into the unit sphere
+        cell = (np.arange(19)[:, None] * 20 + np.arange(19)[None, :]).ravel()
+        self._sphere_faces = np.concatenate((
+            np.column_stack((cell, cell + 20, cell + 1)),
+            np.column_stack((cell + 1, cell + 20, cell + 21))
+        ))
+        
+        circle = np.linspace(0, 2*np.pi, 50)
+        self._unit_circle = (np.cos(circle).astype(np.float32), np.sin(circle).astype(np.float32))
+        
+        # (primary id, others id, 3D) -> static figure, built once per pair of
+        # trajectory objects; the objects are kept so their ids stay unique
+        self._figure_cache: Dict[Tuple[int, int, bool], Dict[str, Any]] = {}
+    
+    def create_airspace_plot(self, primary_trajectory: Union[List[Dict], Dict[str, np.ndarray]], 
                            other_trajectories: List[Dict], 
                            conflict_results: Dict, 
                            current_time: float = 0,
-                           enable_3d: bool = True) -> go.Figure:
+                           enable_3d: bool = True,
+                           primary_position: Dict = None,
+                           other_positions: Dict[str, Dict] = None) -> go.Figure:
         """
         Create main airspace visualization with all trajectories and conflicts.
+        
+        Trajectories are point lists or their structure-of-arrays form (see
+        `utils.to_soa`); other flights are {'trajectory', 'flight_id'} entries.
+        
+        `primary_position` and `other_positions` (keyed by flight id) are optional
+        precomputed current positions; when omitted they are looked up from the
+        trajectories at `current_time`.
+        
+        The trajectory traces and layout are built once per pair of trajectory
+        objects, which are treated as read-only; later calls with the same objects
+        update the position markers and conflict zones of the same figure in place.
         """
-        fig = go.Figure()
+        static = self._static_plot(primary_trajectory, other_trajectories, enable_3d)
+        primary_trajectory, other_trajectories = static['primary'], static['others']
+        
+        if primary_position is None:
+            primary_position = self._get_position_at_time(primary_trajectory, current_time)
+        if other_positions is None:
+            other_positions = {
+                traj_data['flight_id']: self._get_position_at_time(traj_data['trajectory'], current_time)
+                for traj_data in other_trajectories
+            }
+        
+        conflicts = conflict_results['conflicts'] if conflict_results else []
+        conflict_times = self._conflict_times(conflict_results)
+        traces = static['traces']
+        
+        # Current position markers
+        if traces['primary_position'] is not None:
+            self._set_marker_positions(traces['primary_position'],
+                                       [primary_position] if primary_position else [],
+                                       f'Primary @ {current_time}s', enable_3d)
+        if traces['other_positions'] is not None:
+            self._set_marker_positions(traces['other_positions'],
+                                       [pos for pos in other_positions.values() if pos],
+                                       f'Others @ {current_time}s', enable_3d)
         
+        # Conflict zones near the current time
         if enable_3d:
-            fig = self._create_3d_plot(primary_trajectory, other_trajectories, 
-                                     conflict_results, current_time)
+            traces['conflict_zones'].update(
+                self._conflict_zones_3d(conflicts, conflict_times, current_time)
+            )
         else:
-            fig = self._create_2d_plot(primary_trajectory, other_trajectories, 
-                                     conflict_results, current_time)
+            traces['conflict_zones'].update(
+                self._conflict_zones_2d(conflicts, conflict_times, current_time)
+            )
+        
+        return static['figure']
+    
+    def _static_plot(self, primary_trajectory: Union[List[Dict], Dict[str, np.ndarray]], 
+                     other_trajectories: List[Dict], enable_3d: bool) -> Dict[str, Any]:
+        """
+        Cached figure with the trajectory traces and layout, plus the
+        structure-of-arrays trajectories and the per-frame traces to update.
+        """
+        key = (id(primary_trajectory), id(other_trajectories), enable_3d)
+        cached = self._figure_cache.pop(key, None)
+        if (cached is not None and cached['sources'][0] is primary_trajectory
+                and cached['sources'][1] is other_trajectories):
+            # Most recently used last
+            self._figure_cache[key] = cached
+            return cached
+        
+        # Bounded: the least recently used figure is dropped
+        if len(self._figure_cache) >= 8:
+            del self._figure_cache[next(iter(self._figure_cache))]
+        
+        # Work on structure-of-arrays trajectories from here on
+        primary_soa = to_soa(primary_trajectory)
+        others_soa = [
+            {'trajectory': to_soa(traj_data['trajectory']), 'flight_id': traj_data['flight_id']}
+            for traj_data in other_trajectories
+        ]
+        
+        if enable_3d:
+            fig, traces = self._create_3d_plot(primary_soa, others_soa)
+        else:
+            fig, traces = self._create_2d_plot(primary_soa, others_soa)
         
         # Update layout
         fig.update_layout(
@@ -51,26 +186,35 @@ class VisualizationManager:
             )
         )
         
-        return fig
+        static = {
+            'sources': (primary_trajectory, other_trajectories),
+            'figure': fig,
+            'primary': primary_soa,
+            'others': others_soa,
+            'traces': traces
+        }
+        self._figure_cache[key] = static
+        
+        return static
     
-    def _create_3d_plot(self, primary_trajectory: List[Dict], 
-                       other_trajectories: List[Dict], 
-                       conflict_results: Dict, 
-                       current_time: float) -> go.Figure:
+    def _create_3d_plot(self, primary_trajectory: Dict[str, np.ndarray], 
+                       other_trajectories: List[Dict]) -> Tuple[go.Figure, Dict[str, Any]]:
         """
         Create 3D airspace visualization.
+        
+        Returns the figure and its per-frame traces (position markers and conflict
+        zones), which start out empty.
         """
         fig = go.Figure()
+        traces = {'primary_position': None, 'other_positions': None}
         
         # Add primary trajectory
-        if primary_trajectory:
-            primary_df = pd.DataFrame(primary_trajectory)
-            
+        if len(primary_trajectory['time']):
             # Full trajectory path
             fig.add_trace(go.Scatter3d(
-                x=primary_df['x'],
-                y=primary_df['y'],
-                z=primary_df['z'],
+                x=primary_trajectory['x'],
+                y=primary_trajectory['y'],
+                z=primary_trajectory['z'],
                 mode='lines+markers',
                 line=dict(color=self.color_palette['primary'], width=6),
                 marker=dict(size=3),
@@ -78,68 +222,67 @@ class VisualizationManager:
                 hovertemplate="<b>Primary Mission</b><br>" +
                             "Position: (%{x:.1f}, %{y:.1f}, %{z:.1f})<br>" +
                             "Time: %{text}s<extra></extra>",
-                text=primary_df['time']
+                text=primary_trajectory['time']
             ))
             
             # Current position marker
-            current_pos = self._get_position_at_time(primary_trajectory, current_time)
-            if current_pos:
-                fig.add_trace(go.Scatter3d(
-                    x=[current_pos['x']],
-                    y=[current_pos['y']],
-                    z=[current_pos['z']],
-                    mode='markers',
-                    marker=dict(
-                        size=12,
-                        color=self.color_palette['primary'],
-                        symbol='diamond'
-                    ),
-                    name=f'Primary @ {current_time}s',
-                    showlegend=False
-                ))
-        
-        # Add other trajectories
-        for i, traj_data in enumerate(other_trajectories):
-            trajectory = traj_data['trajectory']
-            flight_id = traj_data['flight_id']
-            
-            if trajectory:
-                traj_df = pd.DataFrame(trajectory)
-                
-                fig.add_trace(go.Scatter3d(
-                    x=traj_df['x'],
-                    y=traj_df['y'],
-                    z=traj_df['z'],
-                    mode='lines+markers',
-                    line=dict(color=self.color_palette['other'], width=4, dash='dot'),
-                    marker=dict(size=2),
-                    name=f'Flight {flight_id}',
-                    hovertemplate=f"<b>Flight {flight_id}</b><br>" +
-                                "Position: (%{x:.1f}, %{y:.1f}, %{z:.1f})<br>" +
-                                "Time: %{text}s<extra></extra>",
-                    text=traj_df['time']
-                ))
-                
-                # Current position for other drones
-                current_pos = self._get_position_at_time(trajectory, current_time)
-                if current_pos:
-                    fig.add_trace(go.Scatter3d(
-                        x=[current_pos['x']],
-                        y=[current_pos['y']],
-                        z=[current_pos['z']],
-                        mode='markers',
-                        marker=dict(
-                            size=8,
-                            color=self.color_palette['other'],
-                            symbol='circle'
-                        ),
-                        name=f'{flight_id} @ {current_time}s',
-                        showlegend=False
-                    ))
-        
-        # Add conflict zones
-        if conflict_results and conflict_results['conflicts']:
-            self._add_conflict_zones_3d(fig, conflict_results['conflicts'], current_time)
+            fig.add_trace(go.Scatter3d(
+                x=[],
+                y=[],
+                z=[],
+                mode='markers',
+                marker=dict(
+                    size=12,
+                    color=self.color_palette['primary'],
+                    symbol='diamond'
+                ),
+                showlegend=False
+            ))
+            traces['primary_position'] = fig.data[-1]
+        
+        # Add other trajectories as one merged trace
+        merged = merge_other_traces(other_trajectories)
+        if len(merged['time']):
+            fig.add_trace(go.Scatter3d(
+                x=merged['x'],
+                y=merged['y'],
+                z=merged['z'],
+                mode='lines+markers',
+                line=dict(color=self.color_palette['other'], width=4, dash='dot'),
+                marker=dict(size=2, color=merged['flight_code']),
+                name='Other Flights',
+                customdata=merged['flight_id'],
+                hovertemplate="<b>Flight %{customdata}</b><br>" +
+                            "Position: (%{x:.1f}, %{y:.1f}, %{z:.1f})<br>" +
+                            "Time: %{text}s<extra></extra>",
+                text=merged['time']
+            ))
+        
+        # Current positions for other drones
+        if other_trajectories:
+            fig.add_trace(go.Scatter3d(
+                x=[],
+                y=[],
+                z=[],
+                mode='markers',
+                marker=dict(
+                    size=8,
+                    color=self.color_palette['other'],
+                    symbol='circle'
+                ),
+                showlegend=False
+            ))
+            traces['other_positions'] = fig.data[-1]
+        
+        # Conflict zones, as one mesh
+        fig.add_trace(go.Mesh3d(
+            opacity=0.3,
+            color=self.color_palette['conflict'],
+            name='Conflict Zones',
+            hovertemplate="%{text}<extra></extra>",
+            showlegend=False
+        ))
+        traces['conflict_zones'] = fig.data[-1]
         
         # Set 3D layout
         fig.update_layout(
@@ -154,24 +297,24 @@ class VisualizationManager:
             )
         )
         
-        return fig
+        return fig, traces
     
-    def _create_2d_plot(self, primary_trajectory: List[Dict], 
-                       other_trajectories: List[Dict], 
-                       conflict_results: Dict, 
-                       current_time: float) -> go.Figure:
+    def _create_2d_plot(self, primary_trajectory: Dict[str, np.ndarray], 
+                       other_trajectories: List[Dict]) -> Tuple[go.Figure, Dict[str, Any]]:
         """
         Create 2D top-down airspace visualization.
+        
+        Returns the figure and its per-frame traces (position marker and conflict
+        zones), which start out empty.
         """
         fig = go.Figure()
+        traces = {'primary_position': None, 'other_positions': None}
         
         # Add primary trajectory
-        if primary_trajectory:
-            primary_df = pd.DataFrame(primary_trajectory)
-            
-            fig.add_trace(go.Scatter(
-                x=primary_df['x'],
-                y=primary_df['y'],
+        if len(primary_trajectory['time']):
+            fig.add_trace(go.Scattergl(
+                x=primary_trajectory['x'],
+                y=primary_trajectory['y'],
                 mode='lines+markers',
                 line=dict(color=self.color_palette['primary'], width=4),
                 marker=dict(size=6),
@@ -179,49 +322,52 @@ class VisualizationManager:
                 hovertemplate="<b>Primary Mission</b><br>" +
                             "Position: (%{x:.1f}, %{y:.1f})<br>" +
                             "Altitude: %{text:.1f}m<extra></extra>",
-                text=primary_df['z']
+                text=primary_trajectory['z']
             ))
             
             # Current position
-            current_pos = self._get_position_at_time(primary_trajectory, current_time)
-            if current_pos:
-                fig.add_trace(go.Scatter(
-                    x=[current_pos['x']],
-                    y=[current_pos['y']],
-                    mode='markers',
-                    marker=dict(
-                        size=15,
-                        color=self.color_palette['primary'],
-                        symbol='diamond'
-                    ),
-                    name=f'Primary @ {current_time}s',
-                    showlegend=False
-                ))
-        
-        # Add other trajectories
-        for traj_data in enumerate(other_trajectories):
-            trajectory = traj_data['trajectory']
-            flight_id = traj_data['flight_id']
-            
-            if trajectory:
-                traj_df = pd.DataFrame(trajectory)
-                
-                fig.add_trace(go.Scatter(
-                    x=traj_df['x'],
-                    y=traj_df['y'],
-                    mode='lines+markers',
-                    line=dict(color=self.color_palette['other'], width=3, dash='dot'),
-                    marker=dict(size=4),
-                    name=f'Flight {flight_id}',
-                    hovertemplate=f"<b>Flight {flight_id}</b><br>" +
-                                "Position: (%{x:.1f}, %{y:.1f})<br>" +
-                                "Altitude: %{text:.1f}m<extra></extra>",
-                    text=traj_df['z']
-                ))
-        
-        # Add conflict zones (2D circles)
-        if conflict_results and conflict_results['conflicts']:
-            self._add_conflict_zones_2d(fig, conflict_results['conflicts'], current_time)
+            fig.add_trace(go.Scattergl(
+                x=[],
+                y=[],
+                mode='markers',
+                marker=dict(
+                    size=15,
+                    color=self.color_palette['primary'],
+                    symbol='diamond'
+                ),
+                showlegend=False
+            ))
+            traces['primary_position'] = fig.data[-1]
+        
+        # Add other trajectories as one merged trace
+        merged = merge_other_traces(other_trajectories)
+        if len(merged['time']):
+            fig.add_trace(go.Scattergl(
+                x=merged['x'],
+                y=merged['y'],
+                mode='lines+markers',
+                line=dict(color=self.color_palette['other'], width=3, dash='dot'),
+                marker=dict(size=4, color=merged['flight_code']),
+                name='Other Flights',
+                customdata=merged['flight_id'],
+                hovertemplate="<b>Flight %{customdata}</b><br>" +
+                            "Position: (%{x:.1f}, %{y:.1f})<br>" +
+                            "Altitude: %{text:.1f}m<extra></extra>",
+                text=merged['z']
+            ))
+        
+        # Conflict zones (2D circles), as one trace
+        fig.add_trace(go.Scatter(
+            x=[],
+            y=[],
+            mode='lines',
+            line=dict(color=self.color_palette['conflict'], width=2, dash='dash'),
+            fill='toself',
+            fillcolor=f"rgba(214, 39, 40, 0.2)",
+            name='Conflict Zones',
+            showlegend=False
+        ))
+        traces['conflict_zones'] = fig.data[-1]
         
         # Set 2D layout
         fig.update_layout(
@@ -231,70 +377,125 @@ class VisualizationManager:
             yaxis=dict(scaleanchor="x", scaleratio=1)
         )
         
-        return fig
+        return fig, traces
+    
+    def _set_marker_positions(self, trace: Any, positions: List[Dict], name: str, 
+                              enable_3d: bool):
+        """
+        Point a position marker trace at the given positions.
+        """
+        axes = ('x', 'y', 'z') if enable_3d else ('x', 'y')
+        trace.update({axis: [pos[axis] for pos in positions] for axis in axes}, name=name)
     
-    def _add_conflict_zones_3d(self, fig: go.Figure, conflicts: List[Dict], current_time: float):
+    def _conflict_zones_3d(self, conflicts: List[Dict], conflict_times: np.ndarray, 
+                           current_time: float) -> Dict[str, Any]:
         """
-        Add 3D conflict zone visualizations.
+        3D conflict zone mesh data: one sphere of vertices and faces per conflict.
         """
-        for conflict in conflicts:
-            # Only show conflicts relevant to current time
-            if abs(conflict['time'] - current_time) <= 30:  # 30 second window
-                center = conflict['location']
-                radius = conflict['safety_buffer']
-                
-                # Create sphere points
-                phi, theta = np.mgrid[0:np.pi:20j, 0:2*np.pi:20j]
-                x_sphere = center['x'] + radius * np.sin(phi) * np.cos(theta)
-                y_sphere = center['y'] + radius * np.sin(phi) * np.sin(theta)
-                z_sphere = center['z'] + radius * np.cos(phi)
-                
-                # Add conflict zone as mesh
-                fig.add_trace(go.Mesh3d(
-                    x=x_sphere.flatten(),
-                    y=y_sphere.flatten(),
-                    z=z_sphere.flatten(),
-                    alphahull=0,
-                    opacity=0.3,
-                    color=self.color_palette['conflict'],
-                    name=f'Conflict Zone @ {conflict["time"]}s',
-                    showlegend=False
-                ))
+        nearby = self._conflicts_in_window(conflicts, conflict_times, current_time)
+        if not nearby:
+            return dict(x=[], y=[], z=[], i=[], j=[], k=[], text=[])
+        
+        centers, radii = self._zone_geometry(nearby)
+        vertices = [
+            (centers[:, axis:axis + 1] + radii * unit).ravel()
+            for axis, unit in enumerate(self._unit_sphere)
+        ]
+        num_vertices = len(self._unit_sphere[0])
+        faces = (np.arange(len(nearby))[:, None, None] * num_vertices
+                 + self._sphere_faces[None]).reshape(-1, 3)
+        labels = np.repeat([f'Conflict Zone @ {conflict["time"]}s' for conflict in nearby],
+                           num_vertices)
+        
+        return dict(
+            x=vertices[0],
+            y=vertices[1],
+            z=vertices[2],
+            i=faces[:, 0],
+            j=faces[:, 1],
+            k=faces[:, 2],
+            text=labels
+        )
     
-    def _add_conflict_zones_2d(self, fig: go.Figure, conflicts: List[Dict], current_time: float):
+    def _conflict_zones_2d(self, conflicts: List[Dict], conflict_times: np.ndarray, 
+                           current_time: float) -> Dict[str, Any]:
         """
-        Add 2D conflict zone visualizations as circles.
+        2D conflict zone circle data; each NaN-separated segment is filled on its own.
         """
-        for conflict in conflicts:
-            if abs(conflict['time'] - current_time) <= 30:
-                center = conflict['location']
-                radius = conflict['safety_buffer']
-                
-                # Create circle
-                theta = np.linspace(0, 2*np.pi, 50)
-                x_circle = center['x'] + radius * np.cos(theta)
-                y_circle = center['y'] + radius * np.sin(theta)
-                
-                fig.add_trace(go.Scatter(
-                    x=x_circle,
-                    y=y_circle,
-                    mode='lines',
-                    line=dict(color=self.color_palette['conflict'], width=2, dash='dash'),
-                    fill='toself',
-                    fillcolor=f"rgba(214, 39, 40, 0.2)",
-                    name=f'Conflict @ {conflict["time"]}s',
-                    showlegend=False
-                ))
+        nearby = self._conflicts_in_window(conflicts, conflict_times, current_time)
+        if not nearby:
+            return dict(x=[], y=[])
+        
+        centers, radii = self._zone_geometry(nearby)
+        gap = np.full((len(nearby), 1), np.nan, dtype=np.float32)
+        x_circles, y_circles = (
+            np.hstack((centers[:, axis:axis + 1] + radii * unit, gap)).ravel()
+            for axis, unit in enumerate(self._unit_circle)
+        )
+        
+        return dict(x=x_circles, y=y_circles)
+    
+    def _zone_geometry(self, conflicts: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (K, 3) zone centers and (K, 1) radii of the given conflicts, as float32.
+        """
+        centers = np.empty((len(conflicts), 3), dtype=np.float32)
+        for axis, key in enumerate(('x', 'y', 'z')):
+            centers[:, axis] = np.fromiter((c['location'][key] for c in conflicts),
+                                           dtype=np.float32, count=len(conflicts))
+        radii = np.fromiter((c['safety_buffer'] for c in conflicts),
+                            dtype=np.float32, count=len(conflicts))[:, None]
+        
+        return centers, radii
     
-    def _get_position_at_time(self, trajectory: List[Dict], target_time: float) -> Dict:
+    def _conflicts_in_window(self, conflicts: List[Dict], conflict_times: np.ndarray, 
+                             current_time: float, window: float = 30) -> List[Dict]:
+        """
+        Conflicts within `window` seconds of the current time, found with one mask.
+        """
+        in_window = np.abs(conflict_times - current_time) <= window
+        return [conflicts[i] for i in np.flatnonzero(in_window)]
+    
+    def _conflict_times(self, conflict_results: Dict) -> np.ndarray:
+        """
+        Time of each conflict, read from the engine's 'conflicts_df' column when present.
+        """
+        if not conflict_results:
+            return np.empty(0)
+        if 'conflicts_df' in conflict_results:
+            return conflict_results['conflicts_df']['time'].to_numpy(dtype=float)
+        
+        conflicts = conflict_results['conflicts']
+        return np.fromiter((c['time'] for c in conflicts), dtype=float, count=len(conflicts))
+    
+    def _get_position_at_time(self, trajectory: Union[List[Dict], Dict[str, np.ndarray]], 
+                              target_time: float) -> Dict:
         """
         Get position at specific time from trajectory.
+        
+        The trajectory points are assumed to be in time order, as produced by
+        the trajectory calculator. The times of a point list are gathered on
+        every call; pass the structure-of-arrays form for repeated lookups.
         """
-        if not trajectory:
+        is_soa = isinstance(trajectory, dict)
+        if is_soa:
+            times = trajectory['time']
+        else:
+            times = np.fromiter((p['time'] for p in trajectory), dtype=float, count=len(trajectory))
+        if len(times) == 0:
             return None
-            
-        # Find closest time point
-        closest_point = min(trajectory, key=lambda p: abs(p['time'] - target_time))
+        
+        # Find closest time point; ties go to the earlier point
+        idx = int(np.searchsorted(times, target_time))
+        if idx == len(times) or (idx > 0 and target_time - times[idx - 1] <= times[idx] - target_time):
+            idx -= 1
+        
+        # First of any points sharing that time
+        idx = int(np.searchsorted(times, times[idx]))
+        if is_soa:
+            closest_point = {key: float(values[idx]) for key, values in trajectory.items()}
+        else:
+            closest_point = trajectory[idx]
         
         # Return position if within reasonable time range
         if abs(closest_point['time'] - target_time) <= 30:
@@ -311,13 +512,18 @@ class VisualizationManager:
         
         fig = go.Figure()
         
-        times = [c['time'] for c in conflicts]
-        severities = [c['severity_score'] for c in conflicts]
-        flight_ids = [c['other_flight_id'] for c in conflicts]
+        times = np.fromiter((c['time'] for c in conflicts), dtype=float, count=len(conflicts))
+        severities = np.fromiter((c['severity_score'] for c in conflicts), dtype=float,
+                                 count=len(conflicts))
+        flight_ids = np.array([c['other_flight_id'] for c in conflicts], dtype=object)
         
-        colors = [self.color_palette['conflict'] if s > 0.7 else 
-                 self.color_palette['other'] if s > 0.4 else 
-                 self.color_palette['safe'] for s in severities]
+        # Severity band per conflict (0 low, 1 medium, 2 high), picked with masks and
+        # colored through a discrete colorscale rather than one color string per marker
+        bands = np.select([severities > 0.7, severities > 0.4], [2, 1], default=0).astype(np.int8)
+        band_colors = [self.color_palette['safe'], self.color_palette['other'],
+                       self.color_palette['conflict']]
+        colorscale = [[edge, color] for band, color in enumerate(band_colors)
+                      for edge in (band / 3, (band + 1) / 3)]
         
         fig.add_trace(go.Scatter(
             x=times,
@@ -325,7 +531,10 @@ class VisualizationManager:
             mode='markers+lines',
             marker=dict(
                 size=12,
-                color=colors,
+                color=bands,
+                colorscale=colorscale,
+                cmin=0,
+                cmax=2,
                 line=dict(width=2, color='white')
             ),
             text=flight_ids,